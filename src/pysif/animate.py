@@ -24,21 +24,70 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 import os
-import io
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.image import imread
 import matplotlib.colors as colors
 from matplotlib.colorbar import ColorbarBase
 import numpy as np
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
-from PIL import Image
-import imageio
-from tqdm.notebook import tqdm
+from PIL import GifImagePlugin, Image
+from tqdm.auto import tqdm
 
 from . import convert_geotiff_to_png
 
+# Map features drawn on every animation, shared so that their geometries are only read
+# from the Natural Earth shapefiles once
+STATES_10M = cfeature.STATES.with_scale("10m")
+BORDERS_10M = cfeature.BORDERS.with_scale("10m")
+
+def _rasterize_features(fig, canvas, axes, map_images, feature_artists) -> None:
+    """
+    Replace the vector map features of the animation with images of themselves.
+
+    The states and borders are the most expensive part of drawing a frame, but they are
+    identical in every frame, so they are drawn once on a transparent canvas and the
+    pixels under each map axes are shown as an image layer on top of the data instead.
+
+    Arguments:
+        fig (Figure): The animation figure, already laid out
+        canvas (FigureCanvasAgg): The canvas the figure is rendered with
+        axes (tuple[GeoAxes, ...]): Map axes holding the features
+        map_images (list[AxesImage]): Data images, hidden while the features are drawn
+        feature_artists (list[FeatureArtist]): Feature artists to replace
+    """
+    zorder = max(artist.get_zorder() for artist in feature_artists)
+    for im in map_images:
+        im.set_visible(False)
+    fig.patch.set_alpha(0)
+    for ax in axes:
+        ax.patch.set_alpha(0)
+    canvas.draw()
+    buffer = np.asarray(canvas.buffer_rgba())
+    height = buffer.shape[0]
+
+    # Crop out each axes before changing anything, since the buffer is reused on redraw
+    overlays = []
+    for ax in axes:
+        x0, y0, x1, y1 = np.round(ax.bbox.extents).astype(int)
+        overlays.append(buffer[height - y1:height - y0, x0:x1].copy())
+
+    for artist in feature_artists:
+        artist.remove()
+    for ax, overlay in zip(axes, overlays):
+        xlim, ylim = ax.get_xlim(), ax.get_ylim()
+        ax.imshow(overlay, extent=(*xlim, *ylim), origin="upper", interpolation="nearest", zorder=zorder)
+        # imshow autoscales to the overlay, which must not move the map
+        ax.set_xlim(xlim)
+        ax.set_ylim(ylim)
+        ax.patch.set_alpha(1)
+    fig.patch.set_alpha(1)
+    for im in map_images:
+        im.set_visible(True)
+
 def create_gosif_comparison_animation(
     year_left: str,
     year_right: str,
@@ -51,7 +100,8 @@ def create_gosif_comparison_animation(
     threshold: int = 32765,
     scale_factor: float = 0.0001,
     geojson_path: str | None = None,
-    speed: float = 1.0
+    speed: float = 1.0,
+    num_workers: int | None = None,
 ) -> str:
     """
     Create an animated GIF comparing GOSIF data between two years.
@@ -67,6 +117,8 @@ def create_gosif_comparison_animation(
         vmin (float): Minimum value for colorbar (default: 0.0)
         vmax (float): Maximum value for colorbar (default: 0.8)
         speed (float): Animation speed in frames per second
+        num_workers (int | None): Number of processes used to convert the geotiffs to
+            PNG, defaults to one per CPU
 
     Returns:
         str: path to the output gif
@@ -90,119 +142,147 @@ def create_gosif_comparison_animation(
     # 8day:    GOSIF_20xxzzz.tif
     files_left: list[tuple[str, datetime]] = []
     files_right: list[tuple[str, datetime]] = []
-    for file in tqdm(gosif_files, desc="Exporting geotiffs as PNG"):
-        bname = os.path.basename(file)
-        year = int(bname[6:10])
-        
-        # Handle case where out-of-range files may be present
-        if str(year) not in [year_left, year_right]:
-            continue
-
-        bname_noext = os.path.splitext(bname)[0]
-        gpng = os.path.join(temp_dir, bname_noext + ".png")
-        convert_geotiff_to_png(
-            file,
-            gpng,
-            vmin=int(vmin/scale_factor),
-            vmax=int(vmax/scale_factor),
-            bounds=bbox,
-            threshold=threshold,
-            scale_factor=scale_factor,
-            geojson_path=geojson_path,
-            verbose=False
-        )
-
-        if "M" in bname:
-            month = int(bname[12:14])
-            date = datetime(year, month, 1)
-        elif len(bname) > 15:
-            # i.e., the basename is longer than just an annual filename
-            doy = int(bname[10:13])
-            date = datetime(year, 1, 1) + timedelta(days=doy-1)
-        else:
-            date = datetime(year, 1, 1)
-        
-        if str(year) == year_left:
-            files_left.append((gpng, date))
-        else:
-            files_right.append((gpng, date))
+    # Each geotiff is rendered to PNG independently, so the conversions are spread over
+    # a process pool
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        conversions = []
+        for file in gosif_files:
+            bname = os.path.basename(file)
+            year = int(bname[6:10])
+            
+            # Handle case where out-of-range files may be present
+            if str(year) not in [year_left, year_right]:
+                continue
+
+            bname_noext = os.path.splitext(bname)[0]
+            gpng = os.path.join(temp_dir, bname_noext + ".png")
+            conversions.append(executor.submit(
+                convert_geotiff_to_png,
+                file,
+                gpng,
+                vmin=int(vmin/scale_factor),
+                vmax=int(vmax/scale_factor),
+                bounds=bbox,
+                threshold=threshold,
+                scale_factor=scale_factor,
+                geojson_path=geojson_path,
+                verbose=False
+            ))
+
+            if "M" in bname:
+                month = int(bname[12:14])
+                date = datetime(year, month, 1)
+            elif len(bname) > 15:
+                # i.e., the basename is longer than just an annual filename
+                doy = int(bname[10:13])
+                date = datetime(year, 1, 1) + timedelta(days=doy-1)
+            else:
+                date = datetime(year, 1, 1)
+            
+            if str(year) == year_left:
+                files_left.append((gpng, date))
+            else:
+                files_right.append((gpng, date))
+
+        for conversion in tqdm(as_completed(conversions), total=len(conversions), desc="Exporting geotiffs as PNG"):
+            # Surface any exception raised in the worker
+            conversion.result()
 
     files_left.sort(key=lambda x: x[1])
     files_right.sort(key=lambda x: x[1])
     assert len(files_left) == len(files_right), f"Found {len(files_left)} files from {year_left}, but {len(files_right)} from {year_right}"
-    animation_frames = []
-    
-    # Process each time step
-    n = 0
-    for lt, rt in tqdm(zip(files_left, files_right), total=len(files_left), desc="Creating animation frames"):
-        file_left = lt[0]
-        date_left = lt[1]
-        month_left = date_left.strftime("%B")
-        file_right = rt[0]
-        date_right = rt[1]
-        month_right = date_right.strftime("%B")
-
-        output_file = f"{output_dir}/frame_{date_left.strftime("%m%d")}.png"
-            
-        # Create a figure with two subplots and horizontal colorbar below
-        fig = plt.figure(figsize=(10, 6))
-        
-        # Define grid for the subplots and colorbar
-        gs = fig.add_gridspec(2, 2, height_ratios=[20, 1], width_ratios=[1, 1])
-        
-        # Create the map subplots
-        ax1 = fig.add_subplot(gs[0, 0], projection=ccrs.PlateCarree())
-        ax2 = fig.add_subplot(gs[0, 1], projection=ccrs.PlateCarree())
-        
-        # Create the colorbar axis spanning both columns
-        cax = fig.add_subplot(gs[1, :])
-        
-        # First subplot - left (typically earlier) year
-        img_left = imread(file_left)
-        extent = (bbox["left"], bbox["right"], bbox["bottom"], bbox["top"])
-        ax1.imshow(img_left, extent=extent, origin="upper")
-        ax1.add_feature(cfeature.STATES.with_scale("10m"), linewidth=0.5, edgecolor="black")
-        ax1.add_feature(cfeature.BORDERS.with_scale("10m"), linewidth=1, edgecolor="black")
-        ax1.set_title(f"{month_left} {year_left}")
-        
-        # Second subplot - right (typically subsequent) year
-        img_right = imread(file_right)
-        ax2.imshow(img_right, extent=extent, origin="upper")
-        ax2.add_feature(cfeature.STATES.with_scale("10m"), linewidth=0.5, edgecolor="black")
-        ax2.add_feature(cfeature.BORDERS.with_scale("10m"), linewidth=1, edgecolor="black")
-        ax2.set_title(f"{month_right} {year_right}")
-        
-        # Add horizontal colorbar
-        norm = colors.Normalize(vmin=vmin, vmax=vmax)
-        cmap = plt.cm.viridis
-        
-        # Create the colorbar
-        cb = ColorbarBase(cax, cmap=cmap, norm=norm, orientation="horizontal")
-        cb.set_label("GOSIF (W/m$^2$/sr/μm)")
-        
-        # Save the figure
-        plt.tight_layout()
-        buf = io.BytesIO()
-        plt.savefig(buf, format="png", dpi=150, bbox_inches="tight")
-        buf.seek(0)
-        pil_image = Image.open(buf)
-        animation_frames.append(pil_image.copy())  # Make a copy since we'll close the buffer
-        buf.close()
-
-        plt.savefig(output_file, format="png", dpi=150, bbox_inches="tight")
-        plt.close()
-        
-        n += 1
-    
-    # Create animated GIF if any combined files were created
-    if animation_frames:
-        gif_path = os.path.join(output_dir, f"GOSIF_comparison_{year_left}v{year_right}.gif")
-        with imageio.get_writer(gif_path, mode="I", fps=speed, optimize=False, loop=0) as writer:
-            for frame in animation_frames:
-                frame_data = np.array(frame)
-                writer.append_data(frame_data)
-        print(f"Created animated GIF: {gif_path} with {len(animation_frames)} frames")
-        return gif_path
-    else:
+    if not files_left:
         print("No matching file pairs found to create GIF")
         return ""
+
+    # The figure, map axes, map features and colorbar are the same for every frame, so
+    # they are built once and only the images and titles are updated per frame
+    fig = plt.figure(figsize=(10, 6), dpi=150)
+    # Frames are rendered straight into an Agg canvas and read back as RGBA arrays,
+    # rather than encoded to PNG and decoded again
+    canvas = FigureCanvasAgg(fig)
+    
+    # Define grid for the subplots and colorbar
+    gs = fig.add_gridspec(2, 2, height_ratios=[20, 1], width_ratios=[1, 1])
+    
+    # Create the map subplots
+    ax1 = fig.add_subplot(gs[0, 0], projection=ccrs.PlateCarree())
+    ax2 = fig.add_subplot(gs[0, 1], projection=ccrs.PlateCarree())
+    
+    # Create the colorbar axis spanning both columns
+    cax = fig.add_subplot(gs[1, :])
+
+    # Left (typically earlier) year and right (typically subsequent) year, the image
+    # data is filled in for each frame
+    extent = (bbox["left"], bbox["right"], bbox["bottom"], bbox["top"])
+    map_images = []
+    feature_artists = []
+    for ax in (ax1, ax2):
+        map_images.append(ax.imshow(np.zeros((1, 1, 4)), extent=extent, origin="upper"))
+        feature_artists.append(ax.add_feature(STATES_10M, linewidth=0.5, edgecolor="black"))
+        feature_artists.append(ax.add_feature(BORDERS_10M, linewidth=1, edgecolor="black"))
+    im_left, im_right = map_images
+    
+    # Add horizontal colorbar
+    norm = colors.Normalize(vmin=vmin, vmax=vmax)
+    cmap = plt.cm.viridis
+    
+    # Create the colorbar
+    cb = ColorbarBase(cax, cmap=cmap, norm=norm, orientation="horizontal")
+    cb.set_label("GOSIF (W/m$^2$/sr/μm)")
+
+    # Lay out once with the first titles in place, they have the same height every frame
+    ax1.set_title(f"{files_left[0][1].strftime('%B')} {year_left}")
+    ax2.set_title(f"{files_right[0][1].strftime('%B')} {year_right}")
+    fig.tight_layout()
+    _rasterize_features(fig, canvas, (ax1, ax2), map_images, feature_artists)
+
+    # Frames are quantized to a shared palette and appended to the GIF file as they are
+    # rendered, so only the current frame is ever held in memory
+    gif_path = os.path.join(output_dir, f"GOSIF_comparison_{year_left}v{year_right}.gif")
+    palette = None
+    # The figure is shared by all frames, make sure it is closed even if one fails
+    try:
+        with open(gif_path, "wb") as gif:
+            # Process each time step
+            n = 0
+            for lt, rt in tqdm(zip(files_left, files_right), total=len(files_left), desc="Creating animation frames"):
+                file_left = lt[0]
+                date_left = lt[1]
+                month_left = date_left.strftime("%B")
+                file_right = rt[0]
+                date_right = rt[1]
+                month_right = date_right.strftime("%B")
+
+                output_file = f"{output_dir}/frame_{date_left.strftime('%m%d')}.png"
+
+                im_left.set_data(imread(file_left))
+                ax1.set_title(f"{month_left} {year_left}")
+                im_right.set_data(imread(file_right))
+                ax2.set_title(f"{month_right} {year_right}")
+
+                # Render the frame once, and save the same pixels to disk and to the animation
+                canvas.draw()
+                # Converting to RGB copies the pixels out of the reused canvas buffer
+                rgb = Image.fromarray(np.asarray(canvas.buffer_rgba())).convert("RGB")
+                # Fast zlib level, the frames are mainly an input to the GIF
+                rgb.save(output_file, format="png", compress_level=1)
+                if palette is None:
+                    # Every frame shows the whole colormap in the colorbar, so a palette
+                    # from the first frame fits all of them and is only computed once. It
+                    # is written as the global color table, which every frame refers to.
+                    palette = rgb.quantize(colors=256)
+                    header, _ = GifImagePlugin.getheader(palette.copy(), info={"loop": 0})
+                    gif.write(b"".join(header))
+                # Map onto the shared palette without dithering, which is fast and keeps
+                # the flat map colors from speckling between frames
+                gif_frame = rgb.quantize(palette=palette, dither=Image.Dither.NONE)
+                gif.write(b"".join(GifImagePlugin.getdata(gif_frame, duration=1000 / speed)))
+
+                n += 1
+            gif.write(b";")  # GIF trailer
+    finally:
+        plt.close(fig)
+
+    print(f"Created animated GIF: {gif_path} with {n} frames")
+    return gif_path
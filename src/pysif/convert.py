@@ -146,10 +146,15 @@ def convert_geotiff_to_png(
     if threshold:
         mask = data > threshold
 
-    valid_data = np.ma.masked_array(data, mask)
-
-    range_min = vmin or np.nanmin(valid_data)
-    range_max = vmax or np.nanmax(valid_data)
+    # Nodata pixels are set to NaN, which the colormap draws with its "bad" color, rather
+    # than wrapping the data in a masked array
+    valid_data = data.astype(np.float32)
+    valid_data[mask] = np.nan
+
+    # Python floats, since NumPy scalars are not JSON serializable in the metadata. An
+    # explicit bound of 0 is honored rather than replaced by the data range.
+    range_min = float(vmin if vmin is not None else np.nanmin(valid_data))
+    range_max = float(vmax if vmax is not None else np.nanmax(valid_data))
     norm_data = colors.Normalize(vmin=range_min, vmax=range_max)
 
     dpi = 360
@@ -158,7 +163,7 @@ def convert_geotiff_to_png(
 
     # Create a masked version where values > threshold will be transparent
     cmap = plt.cm.viridis.copy()
-    cmap.set_bad(alpha=0)  # Set masked values to be transparent
+    cmap.set_bad(alpha=0)  # Set masked (NaN) values to be transparent
 
     fig = plt.figure(figsize=(width_inches, height_inches), dpi=dpi)
     ax = plt.Axes(fig, (0, 0, 1, 1))  # No margins
@@ -200,9 +205,9 @@ def convert_geotiff_to_png(
     ax.set_xlim(dst_bounds["left"], dst_bounds["right"])
     ax.set_ylim(dst_bounds["bottom"], dst_bounds["top"])
     
-    plt.savefig(
-        output_png_path, dpi=dpi, bbox_inches="tight", pad_inches=0, transparent=True
-    )
+    # The axes fill the figure with no margins, so the figure is already cropped to the
+    # data and a "tight" bbox would only add a second render to measure it
+    plt.savefig(output_png_path, dpi=dpi, transparent=True)
     plt.close(fig)
 
     # Get metadata for georeferencing and colormapping
@@ -23,13 +23,23 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from datetime import datetime, timedelta
+import calendar
 import matplotlib.pyplot as plt
+import matplotlib.colors as colors
+from matplotlib.collections import PathCollection
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
 import numpy as np
 import numpy.typing as npt
 
+SAMPLE_BACKENDS = ["auto", "scatter", "raster"]
+# Width in pixels of the raster used to draw large sample sets, the height is chosen
+# to keep the pixels square for the requested map extents
+RASTER_WIDTH = 1200
+# Resolution of saved plots, which is also the resolution of the rasterized data layer
+# when saving to a vector format (PDF/SVG)
+SAVEFIG_DPI = 300
+
 
 def plot_samples(
     samples: npt.NDArray[np.float32],
@@ -44,10 +54,15 @@ def plot_samples(
     title: str | None = None,
     label: str | None = None,
     outfile: str | None = None,
+    backend: str = "auto",
+    raster_threshold: int = 50_000,
+    decimate: bool = False,
 ) -> None:
     """
     Plots sample values at the corresponding latitude and longitude coordinates
-    on a world map.
+    on a world map. If the samples have already been gridded (e.g., with
+    create_gridded_raster), prefer plot_gridded, which draws a single mesh rather than
+    one marker per sample and is much faster for more than ~100k samples.
 
     Arguments:
         samples (np.ndarray): 1D array of sample values
@@ -61,12 +76,23 @@ def plot_samples(
         title (str): Optionally provide a title for the plot
         label (str): Optionally provide a name and unit for the sample quantities
         outfile (str): Optionally save the plot as an image
+        backend (str): One of "scatter", "raster", or "auto" (default). The raster
+            backend averages the samples into a fixed grid of pixels and draws them as
+            a single image, which is much faster than a scatter plot for large inputs.
+            "auto" uses the raster backend when there are more than raster_threshold
+            samples.
+        raster_threshold (int): Number of samples above which the "auto" backend
+            switches from a scatter plot to a raster. Default is 50,000.
+        decimate (bool): When drawing a scatter plot, drop samples that are NaN or
+            outside the map extents and keep only one sample per figure pixel.
+            Default is False.
 
     Returns:
         None
 
     Raises:
         ValueError: If the data arrays are not all the same length
+        ValueError: If the backend is not recognized
     """
     _plot_map(
         False,
@@ -82,6 +108,9 @@ def plot_samples(
         title=title,
         label=label,
         outfile=outfile,
+        backend=backend,
+        raster_threshold=raster_threshold,
+        decimate=decimate,
     )
 
 
@@ -117,7 +146,7 @@ def plot_gridded(
         None
 
     Raises:
-        ValueError: If the data arrays are not all the same length
+        ValueError: If the data arrays are not all the same shape
     """
     _plot_map(
         True,
@@ -149,9 +178,26 @@ def _plot_map(
     title: str | None = None,
     label: str | None = None,
     outfile: str | None = None,
+    backend: str = "scatter",
+    raster_threshold: int = 50_000,
+    decimate: bool = False,
 ) -> None:
-    if not (len(data) == len(lat) == len(lon)):
-        raise ValueError("samples, lat, and lon must all have the same length.")
+    if is_grid:
+        # Gridded inputs are 2-D, where len() would only compare the first dimension
+        if not (np.shape(data) == np.shape(lat) == np.shape(lon)):
+            raise ValueError("grid_data, lat, and lon must all have the same shape.")
+    else:
+        # Samples are handled as flat arrays from here on, ravel once up front (a view
+        # for contiguous inputs) rather than leaving each consumer to flatten its own copy
+        data = np.ravel(data)
+        lat = np.ravel(lat)
+        lon = np.ravel(lon)
+        if not (len(data) == len(lat) == len(lon)):
+            raise ValueError("samples, lat, and lon must all have the same length.")
+    if backend not in SAMPLE_BACKENDS:
+        raise ValueError(
+            f"unknown backend: {backend}, must be one of {', '.join(SAMPLE_BACKENDS)}"
+        )
 
     _, ax = plt.subplots(
         subplot_kw={"projection": ccrs.PlateCarree()}, figsize=fig_size
@@ -176,19 +222,52 @@ def _plot_map(
             vmax=vmax,
             cmap=cmap,
             transform=ccrs.PlateCarree(),
+            shading="auto",
+            rasterized=True,
         )
-    else:
-        # Plot the data as a scatter plot
-        chart = ax.scatter(
-            lon,
-            lat,
-            c=data,
+    elif backend == "raster" or (backend == "auto" and len(data) > raster_threshold):
+        # Large numbers of samples are averaged into a fixed grid of pixels so that
+        # matplotlib only has to draw a single image instead of one marker per sample
+        binned = _bin_samples(data, lat, lon, extents)
+        chart = ax.imshow(
+            binned,
+            extent=extents,
+            origin="lower",
+            interpolation="nearest",
             cmap=cmap,
-            s=point_size,
             vmin=vmin,
             vmax=vmax,
             transform=ccrs.PlateCarree(),
         )
+    else:
+        if decimate:
+            # Overlapping markers are not visible, so only keep one sample for each
+            # pixel of the output figure
+            dpi = plt.rcParams["figure.dpi"]
+            width = round(fig_size[0] * dpi)
+            height = round(fig_size[1] * dpi)
+            valid, flat_idx = _pixel_index(data, lat, lon, extents, width, height)
+            _, keep = np.unique(flat_idx, return_index=True)
+            data = data[valid][keep]
+            lat = lat[valid][keep]
+            lon = lon[valid][keep]
+        else:
+            # NaN samples are never drawn, so drop them before they are projected
+            finite = np.isfinite(data)
+            if not finite.all():
+                data = data[finite]
+                lat = lat[finite]
+                lon = lon[finite]
+        # Project the samples into the map's coordinate system once up front, rather
+        # than having cartopy re-transform every point each time the figure is drawn
+        points = ax.projection.transform_points(ccrs.PlateCarree(), lon, lat)
+        # Plot the data as a scatter plot. The markers are rasterized (see
+        # _make_collection) so that vector outputs (PDF/SVG) contain a single image
+        # rather than one path per sample, the colorbar and map features stay as vectors.
+        norm = colors.Normalize(vmin=vmin, vmax=vmax)
+        chart = _make_collection(ax, cmap, point_size, norm)
+        chart.set_offsets(points[:, :2])
+        chart.set_array(data)
 
     cbar = plt.colorbar(chart, ax=ax, orientation="horizontal", pad=0.05, fraction=0.05)
 
@@ -201,61 +280,81 @@ def _plot_map(
         plt.title(title)
 
     if outfile:
-        plt.savefig(outfile, bbox_inches="tight", dpi=300)
+        plt.savefig(outfile, bbox_inches="tight", dpi=SAVEFIG_DPI)
         print(f"Plot saved to {outfile}")
 
     plt.show()
 
-'''
-def plot_two_years_comparison(
-        doy_list: list[int],
-        values_a: list[float],
-        year_a: str | int, 
-        values_b: list[float],
-        year_b: str | int,
-        ylabel="GOSIF",
-        title=None):
+
+def _make_collection(
+    ax: plt.Axes, cmap: str, point_size: int, norm: colors.Normalize
+) -> PathCollection:
     """
-    Plot two time series from different years for comparison.
-    
-    Arguments:
-        doy_list (list[int]): Day of year within the respective year
-        values_a, values_b (list[float]):  Value arrays for each year
-        year_a, year_b (str | int): Year labels for the legend
-        ylabel (str):  Y-axis label
-        title (str): Plot title (auto-generated if None)
-    
+    Create an empty scatter collection with a fixed normalization. New samples can be
+    drawn by updating the collection with set_offsets and set_array, which avoids
+    rebuilding the marker path and normalization for every set of samples, e.g., when
+    exporting a series of frames.
+    """
+    empty = np.empty(0)
+    return ax.scatter(
+        empty, empty, c=empty, cmap=cmap, s=point_size, norm=norm, rasterized=True
+    )
+
+
+def _pixel_index(
+    data: npt.NDArray[np.float32],
+    lat: npt.NDArray[np.float32],
+    lon: npt.NDArray[np.float32],
+    extents: list[float],
+    width: int,
+    height: int,
+) -> tuple[npt.NDArray[np.bool_], npt.NDArray[np.intp]]:
+    """
+    Find the pixel of a width x height raster covering the map extents that each
+    sample falls into.
+
     Returns:
-        None
+        A tuple of:
+        npt.NDArray[np.bool_]: Mask of the samples that are finite and within the extents
+        npt.NDArray[np.intp]: Flattened (row-major) pixel index of each valid sample
     """
-    # Create the plot
-    plt.figure(figsize=(12, 6))
-    
-    # Plot both time series
-    plt.plot(doy_list, values_a, "b-", linewidth=2,
-             label=str(year_a), alpha=0.8)
-    plt.plot(doy_list, values_b, "r-", linewidth=2,
-             label=str(year_b), alpha=0.8)
-    
-    # Set title if not provided
-    if title is None:
-        title = f"{ylabel} Comparison: {year_a} vs {year_b}"
-    
-    # Format the plot
-    plt.title(title, fontsize=14, fontweight="bold")
-    plt.ylabel(ylabel, fontsize=12)
-    plt.xlabel("Day of Year", fontsize=12)
-    
-    # Format x-axis dates
-    plt.xticks(rotation=45)
-    
-    # Add legend
-    plt.legend(fontsize=11, loc="best")
-    
-    # Adjust layout
-    plt.tight_layout()
-    plt.show()
-'''
+    lon_min, lon_max, lat_min, lat_max = extents
+    valid = (
+        np.isfinite(data)
+        & (lon >= lon_min)
+        & (lon <= lon_max)
+        & (lat >= lat_min)
+        & (lat <= lat_max)
+    )
+    ix = ((lon[valid] - lon_min) * (width / (lon_max - lon_min))).astype(np.intp)
+    iy = ((lat[valid] - lat_min) * (height / (lat_max - lat_min))).astype(np.intp)
+    # Samples exactly on the upper edges belong to the last row/column
+    np.clip(ix, 0, width - 1, out=ix)
+    np.clip(iy, 0, height - 1, out=iy)
+    return (valid, iy * width + ix)
+
+
+def _bin_samples(
+    data: npt.NDArray[np.float32],
+    lat: npt.NDArray[np.float32],
+    lon: npt.NDArray[np.float32],
+    extents: list[float],
+) -> npt.NDArray[np.float64]:
+    """
+    Average samples into a regular lat/lon raster covering the map extents. Pixels
+    without any samples are NaN so they are drawn as transparent.
+    """
+    lon_min, lon_max, lat_min, lat_max = extents
+    width = RASTER_WIDTH
+    height = max(1, round(width * (lat_max - lat_min) / (lon_max - lon_min)))
+    valid, flat_idx = _pixel_index(data, lat, lon, extents, width, height)
+
+    counts = np.bincount(flat_idx, minlength=width * height)
+    sums = np.bincount(flat_idx, weights=data[valid], minlength=width * height)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        binned = sums / counts
+    return binned.reshape(height, width)
+
 
 def plot_two_years_comparison(
         doy_list: list[int],
@@ -322,14 +421,16 @@ def plot_two_years_comparison(
             x_range = max(doy_list) - min(doy_list)
             x_offset = x_range * 0.01  # 1% of x-range for horizontal shift
             
-            # Add data labels for the highlighted region
-            for i, (doy, val_a, val_b) in enumerate(zip(highlight_doy, highlight_values_a, highlight_values_b)):
+            # Add data labels for the highlighted region, on the axes directly rather
+            # than looking up the current axes through pyplot for every label
+            ax = plt.gca()
+            for doy, val_a, val_b in zip(highlight_doy, highlight_values_a, highlight_values_b):
                 # Label for year A (positioned above the point)
-                plt.text(doy - x_offset, val_a + offset, f'{val_a:.2f}', 
+                ax.text(doy - x_offset, val_a + offset, f'{val_a:.2f}',
                         color=color_a, fontsize=9, ha='center', va='bottom')
-                
+
                 # Label for year B (positioned below the point)
-                plt.text(doy + x_offset, val_b - offset, f'{val_b:.2f}', 
+                ax.text(doy + x_offset, val_b - offset, f'{val_b:.2f}',
                         color=color_b, fontsize=9, ha='center', va='top')
 
             y_min, y_max = plt.ylim()
@@ -346,23 +447,16 @@ def plot_two_years_comparison(
     if title is None:
         title = f"{ylabel} Comparison: {year_a} vs {year_b}"
 
-    def doy_to_month_label(doy):
-        """Convert day of year to month name."""
-        # Use a reference year (e.g., 2020 which is a leap year to handle DOY 366)
-        date = datetime(2020, 1, 1) + timedelta(days=doy - 1)
-        return date.strftime('%b')
-    
-    # Create month labels and positions for major ticks
-    unique_months = []
-    month_positions = []
-    seen_months = set()
-    
-    for i, doy in enumerate(doy_list):
-        month_label = doy_to_month_label(doy)
-        if month_label not in seen_months:
-            unique_months.append(month_label)
-            month_positions.append(doy)
-            seen_months.add(month_label)
+    # Create month labels and positions for major ticks, one at the first day of year
+    # that falls in each month. Use a reference year (e.g., 2020 which is a leap year to
+    # handle DOY 366) to convert all of the days of year to months at once
+    doy_arr = np.asarray(doy_list)
+    dates = np.datetime64("2020-01-01") + (doy_arr - 1).astype("timedelta64[D]")
+    months = dates.astype("datetime64[M]").astype(np.int64) % 12
+    _, first_idx = np.unique(months, return_index=True)
+    first_idx.sort()
+    unique_months = [calendar.month_abbr[m + 1] for m in months[first_idx]]
+    month_positions = doy_arr[first_idx]
     
     # Set x-axis ticks and labels
     plt.xticks(month_positions, unique_months, rotation=0)  # rotation=0 for horizontal
@@ -23,13 +23,17 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-from bs4 import BeautifulSoup, Tag
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
+from functools import cached_property
 import gzip
+from itertools import groupby
+from lxml import etree
 import math
+from netCDF4 import Dataset
+import numpy as np
 import os
 from pathlib import Path
 from pydap.client import open_url
@@ -39,7 +43,8 @@ import re
 import requests
 import requests_cache
 import shutil
-from tqdm.notebook import tqdm
+import time
+from tqdm.auto import tqdm
 from urllib.parse import urljoin, urlparse
 from urllib3.util.retry import Retry
 
@@ -47,6 +52,21 @@ os.makedirs("pydap-cache", exist_ok=True)
 pydap.lib.CACHE = "pydap-cache/" # type: ignore
 
 
+# Patterns for classifying links in OpenDAP directory listings. The URLs are plain
+# ASCII, so re.ASCII lets \d match only [0-9] without consulting the Unicode tables.
+YEAR_PATTERN = re.compile(r"/(\d{4})/contents\.html$", re.ASCII)
+DOY_PATTERN = re.compile(r"/(\d{3})/contents\.html$", re.ASCII)
+NC4_PATTERN = re.compile(r"/([^/]*?)_(\d{6})_.*?\.nc4?(?:\.dmr)?\.html$", re.ASCII)
+# Combination of the patterns above for classifying the contents of a directory in
+# a single pass over each link
+LINK_PATTERN = re.compile(
+    r"/(?P<year>\d{4})/contents\.html$"
+    r"|/(?P<doy>\d{3})/contents\.html$"
+    r"|/(?P<name>[^/]*?)_(?P<date>\d{6})_.*?\.nc4?(?:\.dmr)?\.html$",
+    re.ASCII,
+)
+
+
 def year_doy_to_datetime(year: int, doy: int) -> datetime:
     """
     Convert an integer year and day of year (DOY) to a datetime object.
@@ -58,7 +78,7 @@ def year_doy_to_datetime(year: int, doy: int) -> datetime:
     Returns:
         datetime: A datetime object representing the date.
     """
-    return datetime.strptime(f"{year}-{doy}", "%Y-%j")
+    return datetime(year, 1, 1) + timedelta(days=doy - 1)
 
 
 @dataclass
@@ -74,25 +94,36 @@ class GesDiscDataset:
 
 
 def create_retry_session(
-    username: str | None, password: str | None, retries: int = 5, backoff_factor: float = 1.0
+    username: str | None,
+    password: str | None,
+    retries: int = 5,
+    backoff_factor: float = 1.0,
+    pool_size: int = 16,
+    session: requests.Session | None = None,
 ) -> requests.Session:
     """
     When downloading data from the DAAC's direct data portal (not OpenDAP), the
     server can occasionally return error 503 (Unavailable) when handling too many
-    client requests. This function attempts to mitigate that by retrying the request
-    with a backoff factor.
+    client requests, or other transient 5xx errors. This function attempts to mitigate
+    that by retrying the request with a backoff factor.
 
     Arguments:
         username (str | None): Earthdata username. If not provided, uses the netrc
         password (str | None): Earthdata password
         retries (int): Number of retries to use for the request
         backoff_factor (float): increase in amount of time to space repeated requests
+        pool_size (int): Number of keep-alive connections to hold open per host, this
+            should be at least the number of threads sharing the session
+        session (requests.Session | None): Optionally provide the session to configure,
+            e.g., a requests_cache.CachedSession. A new plain session is created by
+            default.
 
     Returns:
         requests.Session: A session object that will be used for subsequent HTTPS
             requests to the DAAC
     """
-    session = requests.Session()
+    if session is None:
+        session = requests.Session()
     if username and password:
         token_sess = requests.Session()
         token_sess.headers.update({"User-Agent": "earthaccess"})
@@ -120,12 +151,14 @@ def create_retry_session(
 
     retry_strategy = Retry(
         total=retries,
-        status_forcelist=[503],
+        status_forcelist=[500, 502, 503, 504],
         allowed_methods=["HEAD", "GET", "OPTIONS"],
         backoff_factor=backoff_factor,
         raise_on_status=False,
     )
-    adapter = requests.adapters.HTTPAdapter(max_retries=retry_strategy)
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry_strategy
+    )
     session.mount("https://", adapter)
     session.mount("http://", adapter)
 
@@ -138,33 +171,78 @@ class GesDiscDownloader:
     # OpenDAP is basically broken as far as I can tell, and does not allow downloads
     # Use the direct data portal as a backup until this is fixed.
     gesdisc_download_url = "https://oco2.gesdisc.eosdis.nasa.gov/data/"
-    year_pattern = re.compile(r"/(\d{4})/contents\.html$")
-    doy_pattern = re.compile(r"/(\d{3})/contents\.html$")
-    nc4_pattern = re.compile(r"/([^/]*?)_(\d{6})_.*?\.nc4?(?:\.dmr)?\.html$")
+    # The link patterns are defined at module level, these aliases are kept for code
+    # that accesses them through the class
+    year_pattern = YEAR_PATTERN
+    doy_pattern = DOY_PATTERN
+    nc4_pattern = NC4_PATTERN
+    link_pattern = LINK_PATTERN
+    # Number of seconds that parsed directory listings are reused for, matches the
+    # expiry of the HTTP response cache
+    dir_cache_ttl = 300.0
+    # Number of seconds that the listing of all datasets is cached on disk for
+    root_listing_expire_after = 86400
+    # CMR granule search, used to find granules by their spatial extent
+    cmr_granule_url = "https://cmr.earthdata.nasa.gov/search/granules.json"
 
     def __init__(self):
         load_dotenv()
         username = os.getenv("EARTHDATA_USERNAME")
         password = os.getenv("EARTHDATA_PASSWORD")
             
-        self.session = create_retry_session(username, password)
-        self.pydap_session = self.session
-
-        # cache responses in an SQLite database with a TTL of 300 seconds (5 minutes)
-        requests_cache.install_cache(
-            "gesdisc_cache", backend="sqlite", expire_after=300
+        # Directory listings are small and requested repeatedly, so they go through a
+        # session that caches responses in an SQLite database with a TTL of 300 seconds
+        # (5 minutes)
+        self.session = create_retry_session(
+            username,
+            password,
+            session=requests_cache.CachedSession(
+                "gesdisc_cache",
+                backend="sqlite",
+                expire_after=300,
+                # Honor the server's Cache-Control headers, and revalidate expired
+                # listings with If-None-Match/If-Modified-Since so that an unchanged
+                # listing comes back as an empty 304 response
+                cache_control=True,
+            ),
         )
+        # Granules are large binary files that should not be copied into the response
+        # cache, so they are fetched with a plain session that reuses the same token
+        self.download_session = create_retry_session(None, None)
+        self.download_session.headers.update(self.session.headers)
+        self.pydap_session = self.download_session
+        # Parsed directory listings keyed by URL, avoids repeating the request and the
+        # HTML parse when the same directory is listed more than once. Each entry also
+        # stores the time it was listed so that it expires after dir_cache_ttl seconds,
+        # and the ETag or Last-Modified header of the response it was parsed from.
+        self._dir_cache: dict[
+            str, tuple[float, str | None, list[str], list[int]]
+        ] = {}
+
+    @cached_property
+    def datasets(self) -> dict[str, GesDiscDataset]:
+        """
+        The datasets available on the OCO-2/3 GES DISC, keyed by name. The root
+        directory is only listed the first time this is accessed, so creating a
+        downloader does not require a network request.
+        """
+        return {ds: GesDiscDataset(ds) for ds in self.list_datasets()}
 
-        # list the available datasets on initialization to reference later
-        self.datasets = {ds: GesDiscDataset(ds) for ds in self.list_datasets()}
-
-    def list_directory(self, url: str) -> tuple[list[str], list[int]]:
+    def list_directory(
+        self, url: str, expire_after: int | None = None
+    ) -> tuple[list[str], list[int]]:
         """
         List the contents of a directory URL on an OpenDAP portal, e.g.,
         https://oco2.gesdisc.eosdis.nasa.gov/opendap/
 
+        Listings are cached on the downloader instance for dir_cache_ttl seconds, so
+        repeated calls for the same URL do not hit the network. Use
+        clear_directory_cache to force the listings to be fetched again.
+
         Arguments:
             url (str): The URL of the directory on the OpenDAP portal
+            expire_after (int | None): Optionally override the number of seconds the
+                HTTP response is cached for. Defaults to the session's 300 seconds.
 
         Returns:
             A tuple of:
@@ -174,48 +252,100 @@ class GesDiscDownloader:
         Raises:
             requests.exceptions.RequestException: If the directory listing fails
         """
+        cached = self._dir_cache.get(url)
+        if cached is not None and time.monotonic() - cached[0] < self.dir_cache_ttl:
+            return (cached[2], cached[3])
+
+        contents: list[str] = []
+        filesizes: list[int] = []
+        # OpenDAP directories use table rows to denote contents
+        # Directory tables have a DataCatalog itemtype, files have a Dataset itemtype
+        # The listing is parsed incrementally as it streams in, so the full HTML
+        # document is never held in memory as a single string.
+        in_table = False
+        table_closed = False
         try:
-            response = self.session.get(url)
-            response.raise_for_status()
+            with self.session.get(
+                url, stream=True, expire_after=expire_after
+            ) as response:
+                response.raise_for_status()
+                # When the listing has not changed since it was last parsed (the
+                # response cache revalidates expired listings with the server using
+                # conditional requests), reuse the parse instead of reading the body
+                validator = response.headers.get("ETag") or response.headers.get(
+                    "Last-Modified"
+                )
+                if cached is not None and validator and validator == cached[1]:
+                    self._dir_cache[url] = (
+                        time.monotonic(),
+                        validator,
+                        cached[2],
+                        cached[3],
+                    )
+                    return (cached[2], cached[3])
+                # Raw bytes are fed to lxml with the encoding from the response headers,
+                # which skips decoding each chunk to str in Python
+                # Only table and row events are needed, lxml filters out the events
+                # for every other element before they reach Python
+                parser = etree.HTMLPullParser(
+                    events=("start", "end"),
+                    tag=("table", "tr"),
+                    encoding=response.encoding,
+                )
+                for chunk in response.iter_content(chunk_size=65536):
+                    parser.feed(chunk)
+                    for event, elem in parser.read_events():
+                        if elem.tag == "table":
+                            if elem.get("itemtype") != "http://schema.org/DataCatalog":
+                                continue
+                            in_table = event == "start"
+                            table_closed = event == "end"
+                        elif in_table and event == "end" and elem.tag == "tr":
+                            self._parse_directory_row(url, elem, contents, filesizes)
+                            # Drop rows that have already been parsed so the tree does
+                            # not grow with the size of the listing
+                            elem.clear()
+                            while elem.getprevious() is not None:
+                                del elem.getparent()[0]
+                    if table_closed:
+                        # Everything after the catalog table is page boilerplate
+                        break
         except requests.exceptions.RequestException as e:
             print(f"Error accessing GES DISC directory: {str(e)}")
             raise
 
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # OpenDAP directories use table rows to denote contents
-        # Directory tables have a DataCatalog itemtype, files have a Dataset itemtype
-        table = soup.find("table", itemtype="http://schema.org/DataCatalog")
-        if type(table) != Tag:
-            return ([], [])
-
-        contents: list[str] = []
-        filesizes: list[int] = []
-        for row in table.find_all_next("tr"):
-            if type(row) != Tag:
-                continue
-            tds = row.find_all("td")
-            if len(tds) < 3:
-                continue  # not enough columns
-            # First column contains the filename
-            link: Tag | None = tds[0].find("a")
-            if not link:
-                continue
-            href = str(link.get("href"))
-            if href.startswith("http://") or href.startswith("https://"):
-                content_url = href
-            else:
-                # href is a relative URL, so prepend the parent URL
-                content_url = urljoin(url, href)
-            contents.append(content_url.strip())
+        self._dir_cache[url] = (time.monotonic(), validator, contents, filesizes)
+        return (contents, filesizes)
 
-            # Third column has the filename
-            if row.attrs.get("itemtype") == "http://schema.org/Dataset":
-                filesizes.append(int(tds[2].get_text(strip=True)))
-            else:
-                filesizes.append(0)
+    def clear_directory_cache(self) -> None:
+        """Discard all directory listings cached on this downloader."""
+        self._dir_cache.clear()
+
+    @staticmethod
+    def _parse_directory_row(
+        url: str, row, contents: list[str], filesizes: list[int]
+    ) -> None:
+        """Helper to append the link and file size of one OpenDAP table row."""
+        tds = row.findall("td")
+        if len(tds) < 3:
+            return  # not enough columns
+        # First column contains the filename
+        link = tds[0].find(".//a")
+        if link is None:
+            return
+        href = str(link.get("href"))
+        if href.startswith("http://") or href.startswith("https://"):
+            content_url = href
+        else:
+            # href is a relative URL, so prepend the parent URL
+            content_url = urljoin(url, href)
+        contents.append(content_url.strip())
 
-        return (contents, filesizes)
+        # Third column has the filename
+        if row.get("itemtype") == "http://schema.org/Dataset":
+            filesizes.append(int("".join(tds[2].itertext()).strip()))
+        else:
+            filesizes.append(0)
 
     def list_datasets(self) -> list[str]:
         """
@@ -227,10 +357,18 @@ class GesDiscDownloader:
         Raises:
             requests.exceptions.RequestException: If the directory listing fails
         """
-        dataset_urls, _ = self.list_directory(self.oco2_gesdisc_url)
-        datasets = [
-            ds.split("/")[-2] for ds in dataset_urls if ds.split("/")[-2] != "test"
-        ]
+        # The list of datasets rarely changes, so the root listing is kept in the
+        # on-disk response cache for a day rather than the default 5 minutes. This
+        # avoids a request every time a downloader is created in a notebook.
+        dataset_urls, _ = self.list_directory(
+            self.oco2_gesdisc_url, expire_after=self.root_listing_expire_after
+        )
+        datasets: list[str] = []
+        for ds in dataset_urls:
+            # Links are of the form .../opendap/<dataset>/contents.html
+            name = ds.rpartition("/")[0].rpartition("/")[2]
+            if name != "test":
+                datasets.append(name)
         return datasets
 
     def _get_date_extreme(
@@ -241,31 +379,33 @@ class GesDiscDownloader:
 
         year_contents, _ = self.list_directory(year_url)
         available_doy: list[int] = []
-        for link in year_contents:
-            match = self.doy_pattern.search(link)
-            if match:
-                # Shouldn't cause TypeError due to the regex
-                available_doy.append(int(match.group(1)))
-
         # a list of date strings in the format YYMMDD parsed from the
         # filename in the link
         available_nc4: list[str] = []
+        # Bind the pattern's search method once rather than looking it up per link
+        link_search = LINK_PATTERN.search
         for link in year_contents:
-            match = self.nc4_pattern.search(link)
-            if match:
-                available_nc4.append(str(match.group(2)))
+            match = link_search(link)
+            if match is None:
+                continue
+            if match["doy"] is not None:
+                # Shouldn't cause TypeError due to the regex
+                available_doy.append(int(match["doy"]))
+            elif match["date"] is not None:
+                available_nc4.append(match["date"])
 
+        # Zero padded DOY numbers and YYMMDD strings sort in chronological order, so
+        # only the extremum needs to be converted to a datetime
         if len(available_doy) > 0:
-            date_objects = [year_doy_to_datetime(year, doy) for doy in available_doy]
-            is_daily = False
+            doy_extreme = min(available_doy) if find_min else max(available_doy)
+            return (year_doy_to_datetime(year, doy_extreme), False)
         elif len(available_nc4) > 0:
-            date_objects = [datetime.strptime(date, "%y%m%d") for date in available_nc4]
-            is_daily = True
+            date_extreme = min(available_nc4) if find_min else max(available_nc4)
+            return (datetime.strptime(date_extreme, "%y%m%d"), True)
         else:
-            return (datetime.fromtimestamp(0), False)
-
-        date_extreme = min(date_objects) if find_min else max(date_objects)
-        return (date_extreme, is_daily)
+            raise LookupError(
+                f"No granules or day of year directories found in {year_url}"
+            )
 
     def get_dataset_timerange(self, dataset: str) -> tuple[datetime, datetime]:
         """
@@ -280,18 +420,20 @@ class GesDiscDownloader:
 
         Raises:
             ValueError: If the dataset does not exist
+            LookupError: If the dataset has no year directories or granules
         """
-        if dataset not in self.datasets.keys():
+        if dataset not in self.datasets:
             raise ValueError(
                 f"{dataset} is not a dataset available on OCO-2/3 GES DISC"
             )
 
+        entry = self.datasets[dataset]
         # Short circuit the queries if we have already populated the values
         if (
-            self.datasets[dataset].startdate != datetime(2100, 1, 1)
-            and self.datasets[dataset].enddate != datetime(2100, 1, 2)
+            entry.startdate != datetime(2100, 1, 1)
+            and entry.enddate != datetime(2100, 1, 2)
         ):
-            return (self.datasets[dataset].startdate, self.datasets[dataset].enddate)
+            return (entry.startdate, entry.enddate)
 
         dataset_url = f"{self.oco2_gesdisc_url}{dataset}/"
         dir_contents, _ = self.list_directory(dataset_url)
@@ -300,51 +442,116 @@ class GesDiscDownloader:
         # directory, but should be okay as long as OpenDAP format is stable
 
         available_years: dict[int, str] = {}
+        year_search = YEAR_PATTERN.search
         for link in dir_contents:
-            match = self.year_pattern.search(link)
+            match = year_search(link)
             if match:
-                available_years[int(match.group(1))] = link.replace("contents.html", "")
+                available_years[int(match.group(1))] = link.removesuffix("contents.html")
 
+        # Nothing is stored on the dataset entry on failure, so the lookup will be
+        # retried the next time rather than caching a bogus time range
         if not available_years:
-            print(f"Dataset {dataset} is doc-only or had no available products.")
-            return (datetime.fromtimestamp(0), datetime.fromtimestamp(0))
+            raise LookupError(
+                f"Dataset {dataset} is doc-only or had no available products."
+            )
 
         # Now search through the highest and lowest year directory to find the begin
         # and end dates.
         earliest_year = min(available_years)
         latest_year = max(available_years)
 
-        earliest_date, is_daily = self._get_date_extreme(
-            available_years[earliest_year], earliest_year
-        )
-        latest_date, _ = self._get_date_extreme(
-            available_years[latest_year], latest_year, find_min=False
-        )
-        self.datasets[dataset].startdate = earliest_date
-        self.datasets[dataset].enddate = latest_date
-        self.datasets[dataset].daily = is_daily
+        # The two year directories are independent, so list them concurrently rather
+        # than waiting on one round trip after the other
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            earliest_future = executor.submit(
+                self._get_date_extreme, available_years[earliest_year], earliest_year
+            )
+            latest_future = executor.submit(
+                self._get_date_extreme,
+                available_years[latest_year],
+                latest_year,
+                find_min=False,
+            )
+            earliest_date, is_daily = earliest_future.result()
+            latest_date, _ = latest_future.result()
+        entry.startdate = earliest_date
+        entry.enddate = latest_date
+        entry.daily = is_daily
 
         return (earliest_date, latest_date)
 
+    def get_dataset_timeranges(
+        self, datasets: list[str], max_workers: int = 4
+    ) -> dict[str, tuple[datetime, datetime]]:
+        """
+        List the beginning and end times of available products for several datasets,
+        querying the datasets concurrently.
+
+        Arguments:
+            datasets (list[str]): Names of datasets on the OCO-2/3 GES DISC OpenDAP portal
+            max_workers (int): Number of datasets to query at the same time
+
+        Returns:
+            dict[str, tuple[datetime, datetime]]: The beginning and end times of each
+                dataset. Datasets without any available products are left out.
+
+        Raises:
+            ValueError: If one of the datasets does not exist
+        """
+        timeranges: dict[str, tuple[datetime, datetime]] = {}
+        # Listing the datasets here populates them before starting the threads, so that
+        # they all share the same entries, and an unknown name fails before any request
+        available = self.datasets
+        for dataset in datasets:
+            if dataset not in available:
+                raise ValueError(
+                    f"{dataset} is not a dataset available on OCO-2/3 GES DISC"
+                )
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.get_dataset_timerange, ds): ds for ds in datasets
+            }
+            for future in as_completed(futures):
+                dataset = futures[future]
+                try:
+                    timeranges[dataset] = future.result()
+                except LookupError as e:
+                    print(f"Error getting the time range of {dataset}: {e}")
+        return timeranges
+
     def _check_inputs(self, dataset: str) -> None:
         """Helper function to perform initial checks on queries arriving from Jupyter notebooks."""
-        if dataset not in self.datasets.keys():
+        if dataset not in self.datasets:
             raise ValueError(
                 f"{dataset} is not a dataset available on OCO-2/3 GES DISC"
             )
 
         # As a side effect, adds this dataset's timerange to the cached time ranges
         # stored in this class.
+        entry = self.datasets[dataset]
         if (
-            self.datasets[dataset].startdate == datetime(2100, 1, 1)
-            or self.datasets[dataset].enddate == datetime(2100, 1, 2)
+            entry.startdate == datetime(2100, 1, 1)
+            or entry.enddate == datetime(2100, 1, 2)
         ):
             print(f"Checking available dates on GES DISC for {dataset}")
             self.get_dataset_timerange(dataset)
 
-        if not self.datasets[dataset].daily:
+        if not entry.daily:
             raise NotImplementedError("subdaily datasets not implemented")
 
+    def _check_date(self, dataset: str, date: datetime) -> None:
+        """Helper function to check that a dataset has granules available on a date."""
+        self._check_inputs(dataset)
+
+        entry = self.datasets[dataset]
+        if date < entry.startdate or date > entry.enddate:
+            startdate_str = entry.startdate.strftime("%Y-%m-%d")
+            enddate_str = entry.enddate.strftime("%Y-%m-%d")
+            raise ValueError(
+                f"{dataset} granules are not available on {date.strftime('%Y-%m-%d')}",
+                f"\nAvailable dates: {startdate_str} to {enddate_str}",
+            )
+
     def _get_granule_url_by_date(self, dataset: str, date: datetime) -> str:
         """
         Internal helper to get the direct URL for a granule on a given date.
@@ -354,38 +561,145 @@ class GesDiscDownloader:
         # Assume all pre-checks on arguments have been done by the caller, this
         # function is "private"
         year_url = f"{self.oco2_gesdisc_url}{dataset}/{date.year}/"
-        year_contents, file_sizes = self.list_directory(year_url)
-        granules: dict[datetime, tuple[str, int]] = {}
-        for link, size in zip(year_contents, file_sizes):
-            match = self.nc4_pattern.search(link)
-            if match:
-                # Parse the date from the filename and use only the date part.
-                granule_date = datetime.strptime(match.group(2), "%y%m%d")
-                granules[granule_date] = (link, size)
-
-        granule_info = granules.get(date)
-        if granule_info is None:
+        year_contents, _ = self.list_directory(year_url)
+        # Compare the YYMMDD date in each filename against the requested date as a
+        # string, rather than parsing a datetime for every file in the directory
+        needle = date.strftime("%y%m%d")
+        nc4_search = NC4_PATTERN.search
+        for link in year_contents:
+            match = nc4_search(link)
+            if match and match.group(2) == needle:
+                target_granule = link
+                break
+        else:
             raise FileNotFoundError(
                 f"No {dataset} granule found for {date.strftime('%Y-%m-%d')}"
             )
 
-        target_granule, _ = granule_info
         # Replace https with dap4
         target_granule = target_granule.replace("https", "dap4")
         # Remove the ".html" suffix to get the raw netCDF (.nc4) URL.
-        granule_url = (
-            target_granule[: -len(".html")]
-            if target_granule.endswith(".html")
-            else target_granule
-        )
         # Also now we should remove the .dmr suffix (new as far as I can tell)
-        granule_url = (
-            granule_url[: -len(".dmr")]
-            if granule_url.endswith(".dmr")
-            else granule_url
-        )
+        granule_url = target_granule.removesuffix(".html").removesuffix(".dmr")
         return granule_url
 
+    def _get_granule_urls_by_dates(
+        self, dataset: str, dates: list[datetime]
+    ) -> list[tuple[datetime, str, int]]:
+        """
+        Internal helper to find the granules for many dates at once. Each year directory
+        is listed and scanned a single time, rather than once per requested date.
+        Returns a list of (date, OpenDAP URL, size in bytes) tuples, dates without a
+        granule on the DAAC are left out.
+        """
+        found: list[tuple[datetime, str, int]] = []
+        nc4_search = NC4_PATTERN.search
+        dates_by_year = [
+            (year, set(year_dates))
+            for year, year_dates in groupby(sorted(dates), key=lambda d: d.year)
+        ]
+        # Requests spanning several years list the year directories concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            listings = {
+                year: executor.submit(
+                    self.list_directory, f"{self.oco2_gesdisc_url}{dataset}/{year}/"
+                )
+                for year, _ in dates_by_year
+            }
+        for year, requested in dates_by_year:
+            try:
+                directory_urls, file_sizes = listings[year].result()
+            except Exception as e:
+                print(f"Error fetching directory for year {year}: {e}")
+                continue
+
+            for url, size in zip(directory_urls, file_sizes):
+                match = nc4_search(url)
+                if match:
+                    date = datetime.strptime(match.group(2), "%y%m%d")
+                    if date in requested:
+                        # also remove the dmr suffix if present, this is a new thing
+                        opendap_url = url.removesuffix(".html").removesuffix(".dmr")
+                        found.append((date, opendap_url, size))
+        return found
+
+    def get_dates_in_bbox(
+        self,
+        dataset: str,
+        start_date: datetime,
+        end_date: datetime,
+        bbox: tuple[float, float, float, float],
+    ) -> set[datetime] | None:
+        """
+        Find the days in a date range that have a granule intersecting a bounding box,
+        using the spatial extents in the CMR granule metadata. This only needs one JSON
+        request per page of up to 2000 granules, so days outside of a region can be
+        skipped without opening their granules.
+
+        Arguments:
+            dataset (str): The name of a dataset on the OCO-2/3 GES DISC OpenDAP portal,
+                i.e., the CMR short name and version joined by a period
+            start_date (datetime): First day of the date range
+            end_date (datetime): Last day of the date range (inclusive)
+            bbox (tuple[float, float, float, float]): Bounding box as
+                (lon_min, lat_min, lon_max, lat_max)
+
+        Returns:
+            set[datetime] | None: The days (at midnight) with an intersecting granule, or
+                None if CMR could not answer, in which case no day should be skipped
+        """
+        short_name, _, version = dataset.rpartition(".")
+        params = {
+            "short_name": short_name,
+            "version": version,
+            "temporal": f"{start_date:%Y-%m-%d}T00:00:00Z,{end_date:%Y-%m-%d}T23:59:59Z",
+            "page_size": 2000,
+        }
+        try:
+            # Pages after the first are requested with the CMR-Search-After header of the
+            # previous page, and the response cache does not key on request headers, so
+            # the search goes through the uncached session
+            entries = []
+            headers = {}
+            while True:
+                r = self.download_session.get(
+                    self.cmr_granule_url,
+                    params={**params, "bounding_box": ",".join(str(b) for b in bbox)},
+                    headers=headers,
+                    timeout=30,
+                )
+                r.raise_for_status()
+                page = r.json()["feed"]["entry"]
+                entries.extend(page)
+                if len(entries) >= int(r.headers["CMR-Hits"]):
+                    break
+                search_after = r.headers.get("CMR-Search-After")
+                if not page or search_after is None:
+                    # Days on the missing pages would be skipped, so skip nothing
+                    print(f"Warning: incomplete CMR search results for {dataset} granules")
+                    return None
+                headers = {"CMR-Search-After": search_after}
+            if not entries:
+                # Tell "no granule intersects" apart from a dataset that CMR does not
+                # know under this name, which must not cause every day to be skipped
+                r = self.download_session.get(
+                    self.cmr_granule_url, params={**params, "page_size": 1}, timeout=30
+                )
+                r.raise_for_status()
+                if not r.json()["feed"]["entry"]:
+                    return None
+            # Include the day of both ends of each granule, in case a daily granule's
+            # first or last sounding falls just outside of its UTC day
+            return {
+                datetime.strptime(entry[key][:10], "%Y-%m-%d")
+                for entry in entries
+                for key in ("time_start", "time_end")
+                if key in entry
+            }
+        except (requests.RequestException, KeyError, ValueError) as e:
+            print(f"Warning: unable to search CMR for {dataset} granules: {e}")
+            return None
+
     def get_granule_by_date(self, dataset: str, date: datetime):
         """
         Get a pointer to the data from a given day for a dataset. Currently only daily
@@ -403,23 +717,42 @@ class GesDiscDownloader:
             ValueError: If the dataset does not exist
         """
         # Will raise an error if there is an issue with the requested query
-        self._check_inputs(dataset)
-
-        if (
-            date < self.datasets[dataset].startdate
-            or date > self.datasets[dataset].enddate
-        ):
-            startdate_str = self.datasets[dataset].startdate.strftime("%Y-%m-%d")
-            enddate_str = self.datasets[dataset].enddate.strftime("%Y-%m-%d")
-            raise ValueError(
-                f"{dataset} granules are not available on {date.strftime('%Y-%m-%d')}",
-                f"\nAvailable dates: {startdate_str} to {enddate_str}",
-            )
+        self._check_date(dataset, date)
 
         granule_url = self._get_granule_url_by_date(dataset, date)
         # pydap session is used to get around transient errors where EDL_TOKEN causes 401 errors. 
         return open_url(granule_url, session=self.pydap_session)
 
+    def open_granule_by_date(self, dataset: str, date: datetime) -> Dataset:
+        """
+        Get the data from a given day for a dataset by fetching the native netCDF file
+        from the direct data portal in a single request and opening it in memory.
+        This avoids the per-variable round trips of OpenDAP when most of the variables
+        in a granule will be read. Currently only daily datasets are supported.
+
+        Arguments:
+            dataset (str): The name of a dataset on the OCO-2/3 GES DISC OpenDAP portal
+            date (datetime): The requested date of the data
+
+        Returns:
+            Dataset: An in-memory netCDF4 Dataset of the granule
+
+        Raises:
+            FileNotFoundError: No data is available for the requested day in the dataset
+            ValueError: If the dataset does not exist
+            requests.exceptions.RequestException: If the granule download fails
+        """
+        # Will raise an error if there is an issue with the requested query
+        self._check_date(dataset, date)
+
+        granule_url = self._get_granule_url_by_date(dataset, date)
+        archive_url = self._opendap_to_archive_url(dataset, granule_url)
+        # The timeout applies to connecting and to each read, not the whole download
+        response = self.download_session.get(archive_url, timeout=60)
+        response.raise_for_status()
+        filename = os.path.basename(urlparse(archive_url).path)
+        return Dataset(filename, mode="r", memory=response.content)
+
     def _opendap_to_archive_url(self, dataset: str, url: str) -> str:
         # Rough heuristic for figuring out which archive directory to filter to
         if dataset.startswith("OCO2"):
@@ -427,29 +760,61 @@ class GesDiscDownloader:
         else:
             data_dir = "OCO3_DATA"
         # Assumes product is daily (no doy dirs)
-        year = url.split("/")[-2]
-        filename = url.split("/")[-1]
+        parent, _, filename = url.rpartition("/")
+        year = parent.rpartition("/")[2]
         return urljoin(
             self.gesdisc_download_url, f"{data_dir}/{dataset}/{year}/{filename}"
         )
 
-    def _download_file(self, url: str, outpath: Path) -> Path:
+    def _download_file(self, url: str, outpath: Path, expected_size: int = 0) -> Path:
         """
         Internal helper to download a single file from a URL into the specified directory.
-        Returns the Path to the downloaded file.
+        Returns the Path to the downloaded file. If expected_size is provided, an existing
+        file of a different size is treated as incomplete and downloaded again.
         """
         filename = os.path.basename(urlparse(url).path)
         file_path = outpath / filename
-        if file_path.exists():
+        if _is_complete(file_path, expected_size):
             # Skip downloading if the file exists
             # print(f"Skipping {file_path}, already downloaded...")
             return file_path
+        # Data is written to a .part file that is renamed once the download finishes,
+        # so an interrupted download can be resumed from where it stopped
+        part_path = file_path.with_name(file_path.name + ".part")
+        part_size = part_path.stat().st_size if part_path.exists() else 0
+        headers = {}
+        if part_size > 0:
+            headers["Range"] = f"bytes={part_size}-"
         try:
-            with self.session.get(url, stream=True) as r:
+            r = self.download_session.get(url, stream=True, headers=headers)
+            if r.status_code == 416:
+                # The range starts at or past the end of the remote file, so the .part
+                # file is either already complete or stale. The remote size is given
+                # by the Content-Range header as "bytes */<size>".
+                remote_size = r.headers.get("Content-Range", "").rpartition("/")[2]
+                r.close()
+                if remote_size.isdigit():
+                    remote_size = int(remote_size)
+                else:
+                    remote_size = expected_size
+                if remote_size > 0 and part_size == remote_size:
+                    part_path.replace(file_path)
+                    return file_path
+                # Start over without a range, since retrying it would fail the same way
+                part_path.unlink()
+                headers = {}
+                r = self.download_session.get(url, stream=True)
+            with r:
                 r.raise_for_status()
-                with open(file_path, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        f.write(chunk)
+                # Only append if the server honored the range with a 206, a 200 carries
+                # the whole file and appending it would corrupt the download
+                mode = "ab" if headers and r.status_code == 206 else "wb"
+                # Copy straight from the socket in 1 MB blocks, decoding any
+                # Content-Encoding on the fly
+                r.raw.decode_content = True
+                with open(part_path, mode) as f:
+                    shutil.copyfileobj(r.raw, f, length=1024 * 1024)
+            part_path.replace(file_path)
         except Exception as e:
             raise RuntimeError(f"Failed to download {url}: {e}") from e
         return file_path
@@ -462,6 +827,7 @@ class GesDiscDownloader:
         outpath: str | Path,
         parallel: bool = True,
         yes: bool = False,
+        max_workers: int = 3,
     ) -> tuple[list[Path], list[datetime], list[str]]:
         """
         Download a set of granules from a time range of dates, using multithreading by default.
@@ -473,7 +839,11 @@ class GesDiscDownloader:
             outpath (Path): Directory to store the output files. It will be created
                 if it does not exist.
             parallel (bool): Download files in parallel. Default behavior is True.
-            yes (bool): Skip yes/no prompt before downloading.
+            yes (bool): Skip yes/no prompt before downloading, e.g., for use in
+                scripts or other non-interactive batch jobs.
+            max_workers (int): Number of files to download at the same time when
+                parallel is True. Default is 3, values above the session's connection
+                pool size (16) will wait on a free connection.
 
         Returns:
             tuple[list[Path], list[datetime], list[str]]:
@@ -494,53 +864,30 @@ class GesDiscDownloader:
         outpath.mkdir(parents=True, exist_ok=True)
 
         # Generate a list of dates (daily) from start_date to end_date inclusive.
-        current_date = start_date
-        dates: list[datetime] = []
-        while current_date <= end_date:
-            dates.append(current_date)
-            current_date += timedelta(days=1)
-        dates_by_year: dict[int, list[datetime]] = {}
-        for d in dates:
-            dates_by_year.setdefault(d.year, []).append(d)
+        n_days = (end_date - start_date).days + 1
+        dates = [start_date + timedelta(days=i) for i in range(n_days)]
 
         # The tuples are (date, granule_url)
         granule_urls: list[tuple[datetime, str]] = []
-        total_size = 0  # in bytes
-
-        # Build up a list of all requested dates in case the request crosses a
-        # year boundary
-        all_requested_dates: list[datetime] = []
-
-        for year, date_list in dates_by_year.items():
-            all_requested_dates.extend(date_list)
-            year_dir = f"{self.oco2_gesdisc_url}{dataset}/{year}/"
-            try:
-                directory_urls, file_sizes = self.list_directory(year_dir)
-            except Exception as e:
-                print(f"Error fetching directory for year {year}: {e}")
-                continue
-
-            for url, size in zip(directory_urls, file_sizes):
-                match = self.nc4_pattern.search(url)
-                if match:
-                    date = datetime.strptime(match.group(2), "%y%m%d")
-                    if date in date_list:
-                        opendap_url = (
-                            url[: -len(".html")] if url.endswith(".html") else url
-                        )
-                        # also remove the dmr suffix if present, this is a new thing
-                        opendap_url = (
-                            opendap_url[: -len(".dmr")] if opendap_url.endswith(".dmr") else opendap_url
-                        )
-                        archive_url = self._opendap_to_archive_url(dataset, opendap_url)
-                        filename = os.path.basename(urlparse(archive_url).path)
-                        file_path = outpath / Path(filename)
-                        if not file_path.exists():
-                            total_size += size
-                        granule_urls.append((date, archive_url))
+        # Granules that still need to be downloaded as (granule_url, size) tuples,
+        # complete files from a previous run are not requested again
+        pending: list[tuple[str, int]] = []
+        existing_files: list[Path] = []
+        total_size = 0  # in bytes, only counts the pending downloads
+
+        for date, opendap_url, size in self._get_granule_urls_by_dates(dataset, dates):
+            archive_url = self._opendap_to_archive_url(dataset, opendap_url)
+            filename = os.path.basename(urlparse(archive_url).path)
+            file_path = outpath / Path(filename)
+            if _is_complete(file_path, size):
+                existing_files.append(file_path)
+            else:
+                total_size += size
+                pending.append((archive_url, size))
+            granule_urls.append((date, archive_url))
 
         found_dates = list(map(lambda x: x[0], granule_urls))
-        notfound_dates = list(set(all_requested_dates) - set(found_dates))
+        notfound_dates = list(set(dates) - set(found_dates))
 
         if not granule_urls:
             print("No granules found in the specified date range.")
@@ -551,23 +898,33 @@ class GesDiscDownloader:
             print(
                 f"This action will add an additional {int(total_mb)} MB of data to {outpath}"
             )
-            confirm = input("Do you want to continue? (y/N): ")
+            if existing_files:
+                print(
+                    f"{len(existing_files)} granules are already downloaded and will be skipped"
+                )
+            try:
+                confirm = input("Do you want to continue? (y/N): ")
+            except EOFError:
+                # stdin is not interactive, e.g., the downloader is run from a script
+                print("No input available, pass yes=True to skip this prompt.")
+                confirm = ""
             if confirm.lower() not in ("y", "yes"):
                 print("Download cancelled.")
                 return ([], [], [])
 
-        downloaded_files: list[Path] = []
+        downloaded_files: list[Path] = list(existing_files)
         failed_downloads: list[str] = []
 
-        def download_task(url: str) -> Path:
-            return self._download_file(url, outpath)
+        def download_task(url: str, size: int) -> Path:
+            return self._download_file(url, outpath, size)
 
         if parallel:
-            # Setting max_workers to 3 as a default because more workers might be
-            # causing issues server-side
-            with ThreadPoolExecutor(max_workers=3) as executor:
+            # max_workers defaults to 3 because more workers might be causing
+            # issues server-side
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 futures = {
-                    executor.submit(download_task, url): url for _, url in granule_urls
+                    executor.submit(download_task, url, size): url
+                    for url, size in pending
                 }
                 for future in tqdm(
                     as_completed(futures), total=len(futures), desc="Downloading files"
@@ -580,11 +937,9 @@ class GesDiscDownloader:
                         failed_downloads.append(failed_url)
 
         else:
-            for _, url in tqdm(
-                granule_urls, total=len(granule_urls), desc="Downloading files"
-            ):
+            for url, size in tqdm(pending, total=len(pending), desc="Downloading files"):
                 try:
-                    file_path = download_task(url)
+                    file_path = download_task(url, size)
                     downloaded_files.append(file_path)
                 except Exception as e:
                     print(f"Failed to download {url}: {e}")
@@ -593,6 +948,44 @@ class GesDiscDownloader:
         return (downloaded_files, notfound_dates, failed_downloads)
 
 
+def _is_complete(file_path: Path, expected_size: int = 0) -> bool:
+    """
+    Helper to check whether a file has already been downloaded. Sizes of 0 are treated
+    as unknown, in which case any existing file is considered complete.
+    """
+    if not file_path.exists():
+        return False
+    return expected_size <= 0 or file_path.stat().st_size == expected_size
+
+
+def read_dap_variable(
+    variable, chunk_size: int = 65536, max_workers: int = 4
+) -> np.ndarray:
+    """
+    Read an OpenDAP variable in slabs along its first dimension, requesting the slabs
+    concurrently so that the latency of each HTTP round trip overlaps with the others.
+
+    Arguments:
+        variable (BaseType): A pydap variable, e.g., granule["Latitude"]
+        chunk_size (int): Number of elements along the first dimension per request
+        max_workers (int): Number of concurrent requests. Kept small by default since
+            the DAAC can return errors when handling too many client requests.
+
+    Returns:
+        np.ndarray: The full contents of the variable
+    """
+    n = variable.shape[0]
+    if n <= chunk_size:
+        return np.asarray(variable.data[:])
+    bounds = [(i, min(i + chunk_size, n)) for i in range(0, n, chunk_size)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # map preserves the order of the slabs
+        parts = list(
+            executor.map(lambda b: np.asarray(variable.data[b[0] : b[1]]), bounds)
+        )
+    return np.concatenate(parts)
+
+
 def download_file(url: str, output_path: str, verbose: bool = False):
     """
     Download a file from the specified URL to the output path. Very similar to
@@ -813,7 +1206,7 @@ if __name__ == "__main__":
         f"{dataset} has time range {timerange[0].strftime('%Y-%m-%d')} to {timerange[1].strftime('%Y-%m-%d')}"
     )
     granule = dl.get_granule_by_date(dataset, datetime(2019, 12, 1))
-    print(granule["Latitude"].data[:])
+    print(read_dap_variable(granule["Latitude"]))
     """
     downloaded = dl.download_timerange(
         dataset,
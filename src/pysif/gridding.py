@@ -33,7 +33,8 @@ rather than returned from the function. Most functions with a return value of "N
 the values of an array as a side effect.
 """
 
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from glob import glob
 from netCDF4 import Dataset, date2num, Variable
@@ -41,7 +42,7 @@ import numpy as np
 import numpy.typing as npt
 import os
 import re
-from tqdm.notebook import tqdm
+from tqdm.auto import tqdm
 
 from . import GesDiscDownloader
 from . import L2_SCHEMAS
@@ -49,6 +50,8 @@ from . import L2_SCHEMAS
 EQ_STRS = ["=", "==", "eq"]
 GT_STRS = [">", "gt"]
 LT_STRS = ["<", "lt"]
+# Number of multi-cell footprints subdivided together in favg_all
+POINTS_BLOCK = 1024
 
 
 def get_variable_array(
@@ -56,6 +59,7 @@ def get_variable_array(
     variable: str,
     dd: bool = False,
     pydap: bool = True,
+    rows: slice | None = None,
 ) -> npt.NDArray[np.float32]:
     """
     Retrieve a variable's data from a granule and return it as a numpy array of type float32.
@@ -65,30 +69,42 @@ def get_variable_array(
         variable (str): The name of the variable to extract.
         dd (bool): Flag indicating whether to perform a reshape for footprint bounds. Default is False.
         pydap (bool): If False, use syntax for local netCDF data
+        rows (slice | None): Optionally read only this range of pixels. With pydap the
+            slice is sent to the server as a constraint, so only those rows are downloaded.
 
     Returns:
         npt.NDArray[np.float32]: A numpy array of type float32 containing the variable data, reshaped if required.
     """
     if pydap:
         # pydap flattens all variables to the top level by joining group names with an underscore
-        varname = variable.replace("/", "_")
-        data = np.array(granule[varname].data[:], dtype=np.float32) # type: ignore
+        var = granule[variable.replace("/", "_")] # type: ignore
+    elif "/" in variable:
+        group = variable.split("/")[0]
+        varname = variable.split("/")[-1]
+        var = granule[group][varname] # type: ignore
     else:
-        if "/" in variable:
-            group = variable.split("/")[0]
-            varname = variable.split("/")[-1]
-            data = np.array(granule[group][varname][:], dtype=np.float32) # type: ignore
-        else:
-            data = np.array(granule[variable][:], dtype=np.float32) # type: ignore
-    # DD means there is a second index for footprint bounds of dimension 4
+        var = granule[variable] # type: ignore
+    if rows is None:
+        key = slice(None)
+    elif dd and var.shape[0] == 4:
+        # Footprint bounds stored as (4, n_pixels) have the pixels on the second axis
+        key = (slice(None), rows)
+    else:
+        key = rows
+    # The reads already return new arrays, so only convert (and copy) if not float32
+    if pydap:
+        data = np.asarray(var.data[key], dtype=np.float32)
+    else:
+        data = np.asarray(var[key], dtype=np.float32)
+    # DD means there is a second index for footprint bounds of dimension 4, these are
+    # always returned as C-contiguous (n_pixels, 4) so that per-pixel reductions are fast
     if dd:
         if data.shape[0] == 4:
-            # Reshape to (4, prod(si[1:])).T (mimicking Julia’s transpose)
-            reshaped = np.reshape(data, (4, -1), order="F").T
-            return reshaped
+            # Vertices first, a single transposed copy gives (n_pixels, 4) in C order
+            return np.ascontiguousarray(np.reshape(data, (4, -1)).T)
         elif data.shape[-1] == 4:
-            reshaped = np.reshape(data, (-1, 4), order="F")
-            return reshaped
+            # Vertices last, already (n_pixels, 4) in C order
+            return np.reshape(data, (-1, 4))
     # If no reshaping is required, return as is
     return data
 
@@ -101,187 +117,171 @@ def get_granule_date(granule: object, pydap: bool) -> str:
         return granule.date_time_coverage[0].split("T")[0] # type: ignore
 
 
-def div_line(
-    lat1: float,
-    lon1: float,
-    lat2: float,
-    lon2: float,
-    n: int,
-    points: npt.NDArray[np.float32],
-    j: int,
-) -> None:
-    """
-    Subdivide a line between two geographic coordinates into 'n' points and store the result in the provided array.
-
-    Arguments:
-        lat1 (float): Starting latitude.
-        lon1 (float): Starting longitude.
-        lat2 (float): Ending latitude.
-        lon2 (float): Ending longitude.
-        n (int): Number of subdivisions.
-        points (npt.NDArray[np.float32]): Array to store the computed points.
-        j (int): Index in the first dimension of 'points' where the result should be stored.
-
-    Returns:
-        None
-    """
-    dLat = (lat2 - lat1) / (2.0 * n)
-    dLon = (lon2 - lon1) / (2.0 * n)
-    startLat = lat1 + dLat
-    startLon = lon1 + dLon
-    for i in range(n):
-        points[j, i, 0] = startLat + 2 * i * dLat
-        points[j, i, 1] = startLon + 2 * i * dLon
-
-
-# For the first baseline run: subdivide the line into n points and store in lats and lons
-def div_line2(
-    lat1: float,
-    lon1: float,
-    lat2: float,
-    lon2: float,
-    n: int,
-    lats: npt.NDArray[np.float32],
-    lons: npt.NDArray[np.float32],
-) -> None:
-    """
-    Subdivide a line between two geographic coordinates into 'n' points and store the latitude and longitude separately.
-
-    Arguments:
-        lat1 (float): Starting latitude.
-        lon1 (float): Starting longitude.
-        lat2 (float): Ending latitude.
-        lon2 (float): Ending longitude.
-        n (int): Number of subdivisions.
-        lats (npt.NDArray[np.float32]): Array to store computed latitude values.
-        lons (npt.NDArray[np.float32]): Array to store computed longitude values.
-
-    Returns:
-        None
-    """
-    dLat = (lat2 - lat1) / (2.0 * n)
-    dLon = (lon2 - lon1) / (2.0 * n)
-    startLat = lat1 + dLat
-    startLon = lon1 + dLon
-    for i in range(n):
-        lats[i] = startLat + 2 * i * dLat
-        lons[i] = startLon + 2 * i * dLon
-
-
-# Divide the polygon edges into grid points using the two subdivided edges
+# Divide the polygons into n*n grids of points using two subdivided edges
 def get_points(
     points: npt.NDArray[np.float32],
     vert_lat: npt.NDArray[np.float32],
     vert_lon: npt.NDArray[np.float32],
-    n: int,
-    lats_0: npt.NDArray[np.float32],
-    lons_0: npt.NDArray[np.float32],
-    lats_1: npt.NDArray[np.float32],
-    lons_1: npt.NDArray[np.float32],
-):
+    u: npt.NDArray[np.float32],
+    edges: npt.NDArray[np.float32],
+) -> None:
     """
-    Divide polygon edges into grid points using two subdivided edges.
+    Divide polygon edges into grid points using two subdivided edges, for a block of
+    polygons at once.
 
-    This function uses two subdivided lines from the polygon's vertices to generate a grid of points across the polygon.
+    The edges from vertex 0 to 1 and from vertex 3 to 2 are each split into n segments,
+    then each line joining the two edges is split the same way, and the points are the
+    midpoints of those segments. All of the points are computed by broadcasting.
 
     Arguments:
-        points (npt.NDArray[np.float32]): Array to store the generated grid points.
-        vert_lat (npt.NDArray[np.float32]): Array of vertex latitudes (expected length 4).
-        vert_lon (npt.NDArray[np.float32]): Array of vertex longitudes (expected length 4).
-        n (int): Number of subdivisions for each edge.
-        lats_0 (npt.NDArray[np.float32]): Temporary array to store intermediate latitudes from first edge.
-        lons_0 (npt.NDArray[np.float32]): Temporary array to store intermediate longitudes from first edge.
-        lats_1 (npt.NDArray[np.float32]): Temporary array to store intermediate latitudes from second edge.
-        lons_1 (npt.NDArray[np.float32]): Temporary array to store intermediate longitudes from second edge.
+        points (npt.NDArray[np.float32]): Array of shape (block, n, n, 2) to store the
+            generated grid points, latitude first. Only the first m rows are written.
+        vert_lat (npt.NDArray[np.float32]): Array of vertex latitudes, shape (m, 4).
+        vert_lon (npt.NDArray[np.float32]): Array of vertex longitudes, shape (m, 4).
+        u (npt.NDArray[np.float32]): Fractional position of the segment midpoints along
+            a line, (2 * i + 1) / (2 * n) for i in range(n).
+        edges (npt.NDArray[np.float32]): Temporary array of shape (4, block, n) to store
+            the subdivided edges.
 
     Returns:
         None
     """
-    # Note: Julia indexes 1:4; here we assume vert_lat and vert_lon are length-4 arrays.
-    div_line2(vert_lat[0], vert_lon[0], vert_lat[1], vert_lon[1], n, lats_0, lons_0)
-    div_line2(vert_lat[3], vert_lon[3], vert_lat[2], vert_lon[2], n, lats_1, lons_1)
-    for i in range(n):
-        div_line(lats_0[i], lons_0[i], lats_1[i], lons_1[i], n, points, i)
+    m = vert_lat.shape[0]
+    lats_0, lons_0, lats_1, lons_1 = edges[:, :m]
+    np.multiply(u, (vert_lat[:, 1] - vert_lat[:, 0])[:, None], out=lats_0)
+    lats_0 += vert_lat[:, 0, None]
+    np.multiply(u, (vert_lon[:, 1] - vert_lon[:, 0])[:, None], out=lons_0)
+    lons_0 += vert_lon[:, 0, None]
+    np.multiply(u, (vert_lat[:, 2] - vert_lat[:, 3])[:, None], out=lats_1)
+    lats_1 += vert_lat[:, 3, None]
+    np.multiply(u, (vert_lon[:, 2] - vert_lon[:, 3])[:, None], out=lons_1)
+    lons_1 += vert_lon[:, 3, None]
+    # Offsets from the first edge to the second
+    lats_1 -= lats_0
+    lons_1 -= lons_0
+    np.multiply(lats_1[:, :, None], u, out=points[:m, :, :, 0])
+    points[:m, :, :, 0] += lats_0[:, :, None]
+    np.multiply(lons_1[:, :, None], u, out=points[:m, :, :, 1])
+    points[:m, :, :, 1] += lons_0[:, :, None]
 
 
 def favg_all(
     arr: npt.NDArray[np.float32],
-    weight_arr: npt.NDArray[np.float32],
-    lat: npt.NDArray[np.float32],
-    lon: npt.NDArray[np.float32],
+    weight_arr: npt.NDArray[np.uint32],
+    lat: npt.NDArray[np.int32],
+    lon: npt.NDArray[np.int32],
     inp: npt.NDArray[np.float32],
     s: int,
     s2: int,
     n: int,
     points: npt.NDArray[np.float32],
+    edges: npt.NDArray[np.float32] | None = None,
 ) -> None:
     """
-    Aggregate and average input data onto a grid, updating the grid and weight arrays.
+    Aggregate input data onto a grid, updating the grid and weight arrays.
 
-    This function calculates weighted averages for grid cells based on input data and updates the arrays that hold the
+    This function accumulates weighted sums for grid cells based on input data and updates the arrays that hold the
     accumulated values and weights. It also handles cases where the input data corresponds to a single pixel or spans a region.
+    The weighted average of a cell is its sum divided by its weight, which is left to the caller so the division is
+    done once per cell rather than once per pixel.
 
     Arguments:
-        arr (npt.NDArray[np.float32]): 3D array representing the grid data.
-        weight_arr (npt.NDArray[np.float32]): 2D array of weights corresponding to the grid.
-        lat (npt.NDArray[np.float32]): 2D array of latitudes (grid indices) for each pixel.
-        lon (npt.NDArray[np.float32]): 2D array of longitudes (grid indices) for each pixel.
-        inp (npt.NDArray[np.float32]): 2D array of input values for each pixel.
+        arr (npt.NDArray[np.float32]): 3D array of weighted sums for the grid, with shape
+            (n_vars, n_lon, n_lat) so that each variable is a contiguous plane.
+        weight_arr (npt.NDArray[np.uint32]): 2D array of weights corresponding to the
+            grid, counted in sub-points so that a whole pixel has a weight of n*n.
+        lat (npt.NDArray[np.int32]): 2D array of latitude grid indices for each pixel
+            vertex, as returned by coords_to_indices.
+        lon (npt.NDArray[np.int32]): 2D array of longitude grid indices for each pixel
+            vertex, as returned by coords_to_indices.
+        inp (npt.NDArray[np.float32]): 2D array of input values for each pixel, with shape
+            (n_vars, n_pixels).
         s (int): Number of valid pixels.
         s2 (int): Number of variables per pixel.
         n (int): Grid subdivision factor.
-        points (npt.NDArray[np.float32]): Temporary array used for subdividing pixel bounds.
+        points (npt.NDArray[np.float32]): Temporary array of shape (block, n, n, 2) used
+            for subdividing pixel bounds, footprints are subdivided block at a time.
+        edges (npt.NDArray[np.float32] | None): Optional temporary array of shape
+            (4, block, n) used for subdividing the pixel edges, allocated if not provided.
 
     Returns:
         None
     """
     # Here, lat and lon are assumed to be 2D arrays (one row per pixel) holding grid indices.
-    ix = np.zeros(n * n, dtype=np.int32)
-    iy = np.zeros(n * n, dtype=np.int32)
-    lats_0 = np.zeros(n, dtype=np.float32)
-    lons_0 = np.zeros(n, dtype=np.float32)
-    lats_1 = np.zeros(n, dtype=np.float32)
-    lons_1 = np.zeros(n, dtype=np.float32)
-
-    # Compute integer indices from lat, lon arrays
-    iLon = np.floor(lon).astype(np.int32)
-    iLat = np.floor(lat).astype(np.int32)
-    # Minimum and maximum across each row (axis=1)
-    minLat_arr = np.min(np.floor(lat).astype(np.int32), axis=1)
-    maxLat_arr = np.max(np.floor(lat).astype(np.int32), axis=1)
-    minLon_arr = np.min(np.floor(lon).astype(np.int32), axis=1)
-    maxLon_arr = np.max(np.floor(lon).astype(np.int32), axis=1)
-    distLon = maxLon_arr - minLon_arr
-    dimLat = maxLat_arr - minLat_arr
-    dimLon = maxLon_arr - minLon_arr
-    fac = 1.0 / (n * n)
-
-    for i in range(s):
-        if (dimLat[i] == 0) and (dimLon[i] == 0):
-            idx_lon = iLon[i, 0]
-            idx_lat = iLat[i, 0]
-            weight_arr[idx_lon, idx_lat] += 1
-            for z in range(s2):
-                mean_old = arr[idx_lon, idx_lat, z]
-                w = weight_arr[idx_lon, idx_lat]
-                arr[idx_lon, idx_lat, z] = mean_old + (1.0 / w) * (inp[i, z] - mean_old)
-        elif distLon[i] < n:
-            get_points(points, lat[i, :], lon[i, :], n, lats_0, lons_0, lats_1, lons_1)
-            # Floor the subdivided points into indices
-            ix_2d = np.floor(points[:, :, 0]).astype(np.int32)
-            iy_2d = np.floor(points[:, :, 1]).astype(np.int32)
-            ix = ix_2d.flatten()
-            iy = iy_2d.flatten()
-            for j in range(len(ix)):
-                idx_lon = iy[j]
-                idx_lat = ix[j]
-                weight_arr[idx_lon, idx_lat] += fac
-                for z in range(s2):
-                    mean_old = arr[idx_lon, idx_lat, z]
-                    w = weight_arr[idx_lon, idx_lat]
-                    arr[idx_lon, idx_lat, z] = mean_old + (fac / w) * (
-                        inp[i, z] - mean_old
-                    )
+    block = points.shape[0]
+    if edges is None:
+        edges = np.zeros((4, block, n), dtype=np.float32)
+    u = (2 * np.arange(n, dtype=np.float32) + 1) / (2 * n)
+    # Integer cell indices of the sub-points, reused for every block of footprints
+    cell_idx = np.empty((block, n, n), dtype=np.int32)
+    lat_idx = np.empty((block, n, n), dtype=np.int32)
+
+    # lat and lon already hold the integer grid indices of each vertex, so the number of
+    # cells a footprint spans is just the range across each row (axis=1)
+    dimLat = np.ptp(lat, axis=1)
+    dimLon = np.ptp(lon, axis=1)
+    # Weights are counted in sub-points, so a whole footprint has a weight of n*n and
+    # every weight stays an exact integer
+    n_sub = n * n
+    n_lat = weight_arr.shape[1]
+
+    # Most footprints fall inside a single grid cell, these are added all at once by
+    # summing the values and counts per cell
+    single = (dimLat == 0) & (dimLon == 0)
+    if np.any(single):
+        cells, inverse, counts = np.unique(
+            lon[single, 0] * n_lat + lat[single, 0],
+            return_inverse=True,
+            return_counts=True,
+        )
+        # np.bincount sums in one buffered pass, where np.add.at falls back to a slow
+        # unbuffered loop
+        inverse = inverse.ravel()
+        sums = np.stack(
+            [
+                np.bincount(inverse, weights=inp[z, single], minlength=cells.size)
+                for z in range(s2)
+            ]
+        )
+        idx_lon, idx_lat = np.divmod(cells, n_lat)
+        counts = counts.astype(weight_arr.dtype)
+        weight_arr[idx_lon, idx_lat] += counts * n_sub
+        arr[:, idx_lon, idx_lat] += n_sub * sums
+
+    # Footprints spanning several cells (but fewer than n in longitude) are subdivided
+    # into n*n points that each carry an equal share of the footprint's weight. Every
+    # sub-point adds a weight of one, so the points of a block of footprints are summed
+    # per cell in one step, like the single cells.
+    multi = np.flatnonzero(~single & (dimLon < n))
+    for start in range(0, multi.size, block):
+        pix = multi[start : start + block]
+        m = pix.size
+        get_points(points, lat[pix], lon[pix], u, edges)
+        # Floor the subdivided points into flattened grid cell indices, a point exactly
+        # on a grid edge belongs to the cell above it
+        np.floor(points[:m], out=points[:m])
+        cells_m = cell_idx[:m]
+        lats_m = lat_idx[:m]
+        cells_m[...] = points[:m, :, :, 1]
+        lats_m[...] = points[:m, :, :, 0]
+        cells_m *= n_lat
+        cells_m += lats_m
+        cells, inverse, counts = np.unique(
+            cells_m, return_inverse=True, return_counts=True
+        )
+        inverse = inverse.ravel()
+        sums = np.stack(
+            [
+                np.bincount(
+                    inverse, weights=np.repeat(inp[z, pix], n_sub), minlength=cells.size
+                )
+                for z in range(s2)
+            ]
+        )
+        idx_lon, idx_lat = np.divmod(cells, n_lat)
+        counts = counts.astype(weight_arr.dtype)
+        weight_arr[idx_lon, idx_lat] += counts
+        arr[:, idx_lon, idx_lat] += sums
 
 
 def generate_dates(start_date: datetime, end_date: datetime) -> list[datetime]:
@@ -295,12 +295,27 @@ def generate_dates(start_date: datetime, end_date: datetime) -> list[datetime]:
     Returns:
         List[datetime]: List of dates between start_date and end_date.
     """
-    dates: list[datetime] = []
-    current_date = start_date
-    while current_date <= end_date:
-        dates.append(current_date)
-        current_date += timedelta(days=1)
-    return dates
+    n_days = (end_date - start_date).days + 1
+    return [start_date + timedelta(days=i) for i in range(n_days)]
+
+
+def day_in_grid(d: datetime, days_in_grid: set[datetime] | None) -> bool:
+    """
+    Check whether a day has a granule intersecting the grid.
+
+    Arguments:
+        d (datetime): The day to check, any time of day is ignored.
+        days_in_grid (set[datetime] | None): Days (at midnight) with an intersecting
+            granule, as returned by GesDiscDownloader.get_dates_in_bbox. None means
+            that no day is known to miss the grid.
+
+    Returns:
+        bool: False if the day is known to not intersect the grid, otherwise True.
+    """
+    if days_in_grid is None:
+        return True
+    # The dates being gridded keep the time of day of start_date
+    return datetime(d.year, d.month, d.day) in days_in_grid
 
 
 def validate_date_range(
@@ -373,13 +388,45 @@ def get_local_granule(local_dir: str, dataset: str, d: datetime) -> object:
         os.path.join(local_dir, f"{dataset}*{d.strftime('%y%m%d')}*.nc*")
     )
     if len(found_files) > 0:
-        return Dataset(found_files[0], "r")
+        granule = Dataset(found_files[0], "r")
+        # get_variable_array converts every read to a plain float32 array, dropping any
+        # mask anyway, so skip building masked arrays on each read
+        granule.set_auto_mask(False)
+        return granule
     else:
         raise FileNotFoundError(
             f"Unable to find a matching granule for {d.strftime('%y%m%d')}"
         )
 
 
+def coords_to_indices(
+    coords: npt.NDArray[np.float32],
+    c_min: float,
+    c_max: float,
+    n_vals: int,
+) -> npt.NDArray[np.int32]:
+    """
+    Convert coordinates to grid cell indices, clipped to the bounds of the grid.
+
+    The arithmetic is done in place on a single float32 copy of the input, rather than
+    allocating a new temporary for each step, and cast to int32 without a separate floor.
+
+    Arguments:
+        coords (npt.NDArray[np.float32]): Coordinates to convert.
+        c_min (float): Minimum coordinate of the grid.
+        c_max (float): Maximum coordinate of the grid.
+        n_vals (int): Number of grid cells along this axis.
+
+    Returns:
+        npt.NDArray[np.int32]: Grid cell indices with the same shape as coords.
+    """
+    idx = np.subtract(coords, c_min, dtype=np.float32)
+    idx *= n_vals / (c_max - c_min)
+    # Once clipped to be non-negative, the truncating cast is the same as a floor
+    np.clip(idx, 0, n_vals - 1, out=idx)
+    return idx.astype(np.int32)
+
+
 def process_day_granule(
     granule: object,
     lat_min: float,
@@ -392,10 +439,12 @@ def process_day_granule(
     n_vars: int,
     points: npt.NDArray[np.float32],
     mat_data: npt.NDArray[np.float32],
-    mat_data_weights: npt.NDArray[np.float32],
+    mat_data_weights: npt.NDArray[np.uint32],
     schema: dict[str, str],
     filters: dict[str, tuple[str, float]] | None = None,
     pydap: bool = True,
+    edges: npt.NDArray[np.float32] | None = None,
+    reads_done: Callable[[], None] | None = None,
 ) -> None:
     """
     Process a single granule for a given date and update the grid data arrays.
@@ -416,13 +465,20 @@ def process_day_granule(
         lon_vals (npt.NDArray[np.float32]): Array of longitude values for the grid.
         n_vars (int): Number of variables.
         points (npt.NDArray[np.float32]): Temporary array for subdividing pixel bounds.
-        mat_data (npt.NDArray[np.float32]): 3D grid data array to update.
-        mat_data_weights (npt.NDArray[np.float32]): 2D weight array to update.
+        mat_data (npt.NDArray[np.float32]): 3D grid of weighted sums to update, with
+            shape (n_vars, n_lon, n_lat).
+        mat_data_weights (npt.NDArray[np.uint32]): 2D weight array to update, counted in
+            sub-points (see favg_all).
         schema (dict[str, str]): A dictionary describing lat/lon key names in the granules.
         filters (dict[str, tuple[str, float]]): Optionally specify a list of filters
             where they key is the netCDF variable to filter on, and the values are a
             tuple of a comparator string (<, ==, etc.) and the threshold value
         pydap (bool): If True, handle the granule dataset using pydap syntax
+        edges (npt.NDArray[np.float32] | None): Temporary array for subdividing pixel
+            edges, see favg_all.
+        reads_done (Callable[[], None] | None): Optionally called once every variable
+            has been read from the granule, before the pixels are aggregated. It is not
+            called if the granule is rejected before then.
 
     Returns:
         None
@@ -434,80 +490,99 @@ def process_day_granule(
     try:
         lat_granule = get_variable_array(granule, schema["lat"], pydap=pydap)
         lon_granule = get_variable_array(granule, schema["lon"], pydap=pydap)
-        if np.any(
-            (lat_granule > lat_min)
-            & (lat_granule < lat_max)
-            & (lon_granule > lon_min)
-            & (lon_granule < lon_max)
+        # Cheap prefilter on the extent of the granule, which rejects swaths that miss
+        # the grid without allocating any temporaries; pixels are selected precisely below
+        if not (
+            lat_granule.size == 0
+            or lat_granule.max() <= lat_min
+            or lat_granule.min() >= lat_max
+            or lon_granule.max() <= lon_min
+            or lon_granule.min() >= lon_max
         ):
+            # A footprint can only lie inside the grid if its center does, so the other
+            # variables are only read for the rows spanning the centers inside the grid.
+            # With pydap this is a server-side subset, which for a regional grid is a
+            # small part of the granule.
+            rows = None
+            if lat_granule.ndim == 1:
+                in_grid = np.flatnonzero(
+                    (lat_granule >= lat_min)
+                    & (lat_granule <= lat_max)
+                    & (lon_granule >= lon_min)
+                    & (lon_granule <= lon_max)
+                )
+                if in_grid.size == 0:
+                    return
+                rows = slice(int(in_grid[0]), int(in_grid[-1]) + 1)
             lat_in_ = get_variable_array(
-                granule, schema["vertex_lat"], dd=True, pydap=pydap
+                granule, schema["vertex_lat"], dd=True, pydap=pydap, rows=rows
             )
             lon_in_ = get_variable_array(
-                granule, schema["vertex_lon"], dd=True, pydap=pydap
+                granule, schema["vertex_lon"], dd=True, pydap=pydap, rows=rows
             )
-            # If the first dimension is 4, transpose the arrays
-            if lat_in_.shape[0] == 4:
-                lat_in_ = lat_in_.T
-                lon_in_ = lon_in_.T
             # Determine the bounding box per pixel
             min_lat_in = np.min(lat_in_, axis=1)
             max_lat_in = np.max(lat_in_, axis=1)
             min_lon_in = np.min(lon_in_, axis=1)
             max_lon_in = np.max(lon_in_, axis=1)
-            bool_add = (
-                (min_lat_in > lat_min).astype(int)
-                + (max_lat_in < lat_max).astype(int)
-                + (min_lon_in > lon_min).astype(int)
-                + (max_lon_in < lon_max).astype(int)
-                + (((max_lon_in - min_lon_in) < 50).astype(int))
-            )
-            b_counter = 5
+            # AND the conditions into one boolean mask, bailing out as soon as no pixel
+            # is left so that later filter variables are never read
+            # Each comparison is written into the same scratch buffer with out=, so
+            # only two bool arrays are allocated however many conditions there are
+            mask = np.greater(min_lat_in, lat_min)
+            cond = np.empty_like(mask)
+            mask &= np.less(max_lat_in, lat_max, out=cond)
+            mask &= np.greater(min_lon_in, lon_min, out=cond)
+            mask &= np.less(max_lon_in, lon_max, out=cond)
+            mask &= np.less(max_lon_in - min_lon_in, 50, out=cond)
+            if not mask.any():
+                return
             if filters:
-                for key, val in filters.items():
-                    comp = val[0]
-                    thresh = val[1]
-                    key_arr = get_variable_array(granule, key, pydap=pydap)
-                    if comp in EQ_STRS:
-                        bool_add += key_arr == thresh
-                        b_counter += 1
-                    elif comp in GT_STRS:
-                        bool_add += key_arr > thresh
-                        b_counter += 1
-                    elif comp in LT_STRS:
-                        bool_add += key_arr < thresh
-                        b_counter += 1
-                    else:
+                for key, (comp, thresh) in filters.items():
+                    if comp not in EQ_STRS + GT_STRS + LT_STRS:
                         print(
                             f"Ignoring unprocessable filter: ds['{key}'] {comp} {thresh}"
                         )
+                        continue
+                    key_arr = get_variable_array(granule, key, pydap=pydap, rows=rows)
+                    if comp in EQ_STRS:
+                        mask &= np.equal(key_arr, thresh, out=cond)
+                    elif comp in GT_STRS:
+                        mask &= np.greater(key_arr, thresh, out=cond)
+                    else:
+                        mask &= np.less(key_arr, thresh, out=cond)
+                    if not mask.any():
+                        return
 
-            idx = np.where(bool_add == b_counter)[0]
+            idx = np.flatnonzero(mask)
             if idx.size > 0:
-                n_pixels = lat_in_.shape[0]
-                mat_in = np.zeros((n_pixels, n_vars), dtype=np.float32)
+                # One row per variable, so each variable's values are contiguous. Only
+                # the selected pixels are kept, rather than filling an array for every
+                # pixel in the granule and selecting from it afterwards.
+                mat_in = np.empty((n_vars, idx.size), dtype=np.float32)
                 for col, var in enumerate(variables):
-                    mat_in[:, col] = get_variable_array(granule, var, pydap=pydap)
-                iLat_ = np.floor(
-                    ((lat_in_[idx, :] - lat_min) / (lat_max - lat_min)) * len(lat_vals)
-                ).astype(int)
-                iLon_ = np.floor(
-                    ((lon_in_[idx, :] - lon_min) / (lon_max - lon_min)) * len(lon_vals)
-                ).astype(int)
-                iLat_ = np.clip(iLat_, 0, len(lat_vals) - 1)
-                iLon_ = np.clip(iLon_, 0, len(lon_vals) - 1)
+                    mat_in[col, :] = get_variable_array(
+                        granule, var, pydap=pydap, rows=rows
+                    )[idx]
+                if reads_done is not None:
+                    reads_done()
+                iLat_ = coords_to_indices(lat_in_[idx, :], lat_min, lat_max, len(lat_vals))
+                iLon_ = coords_to_indices(lon_in_[idx, :], lon_min, lon_max, len(lon_vals))
                 s = idx.size
-                s2 = mat_in.shape[1]
+                s2 = mat_in.shape[0]
                 favg_all(
                     mat_data,
                     mat_data_weights,
                     iLat_,
                     iLon_,
-                    mat_in[idx, :],
+                    mat_in,
                     s,
                     s2,
-                    n_vars,
+                    # The subdivision factor is the size of the points array, not the
+                    # number of variables
+                    points.shape[1],
                     points,
+                    edges,
                 )
     except Exception as e:
         print(f"Error adding granule for {g_date} to grid, caught: {e}")
@@ -519,16 +594,17 @@ def process_day_worker(args):
     Returns a tuple of:
         - t_ndx (int): time slice index
         - d (datetime): datetime of the time slice (primarily for progress reporting)
-        - mat_data (np array): gridded values for the time slice
+        - mat_data (np array): gridded weighted sums for the time slice
         - mat_data_weights (np array): gridded weighted averaging factors
         - results_status (str): status string for progress reporting
     """
     t_ndx, d, dataset, local_dir, lat_min, lat_max, lon_min, lon_max, variables, lat_vals, lon_vals, n_vars, n_grid, granule_schema, filters = args
     
     # Initialize local arrays for this worker
-    mat_data = np.zeros((len(lon_vals), len(lat_vals), n_vars), dtype=np.float32)
-    mat_data_weights = np.zeros((len(lon_vals), len(lat_vals)), dtype=np.float32)
-    points = np.zeros((n_grid, n_grid, 2), dtype=np.float32)
+    mat_data = np.zeros((n_vars, len(lon_vals), len(lat_vals)), dtype=np.float32)
+    mat_data_weights = np.zeros((len(lon_vals), len(lat_vals)), dtype=np.uint32)
+    points = np.zeros((POINTS_BLOCK, n_grid, n_grid, 2), dtype=np.float32)
+    edges = np.zeros((4, POINTS_BLOCK, n_grid), dtype=np.float32)
     
     try:
         # For parallel processing, we only use local files
@@ -550,6 +626,7 @@ def process_day_worker(args):
             granule_schema,
             filters=filters,
             pydap=False,
+            edges=edges,
         )
         
         result_status = "success"
@@ -567,6 +644,51 @@ def process_day_worker(args):
     return t_ndx, d, mat_data, mat_data_weights, result_status
 
 
+def write_time_slice(
+    ds_time: Variable,
+    ds_n: Variable,
+    nc_dict: dict[str, Variable],
+    t_ndx: int,
+    d: datetime,
+    mat_data: npt.NDArray[np.float32] | None = None,
+    mat_data_weights: npt.NDArray[np.uint32] | None = None,
+    pixel_weight: int = 1,
+) -> None:
+    """
+    Write a single gridded time slice to the output netCDF variables.
+
+    Arguments:
+        ds_time (Variable): The output time variable.
+        ds_n (Variable): The output variable holding the number of pixels per cell.
+        nc_dict (dict[str, Variable]): Output data variables, in the same order as the
+            first axis of mat_data.
+        t_ndx (int): Index of the time slice.
+        d (datetime): Date of the time slice.
+        mat_data (npt.NDArray[np.float32] | None): Gridded weighted sums with shape
+            (n_vars, n_lon, n_lat), or None if there is no data for this time slice.
+            These are divided by the weights to get the averages written to file.
+        mat_data_weights (npt.NDArray[np.uint32] | None): Gridded weights with shape
+            (n_lon, n_lat), or None if there is no data for this time slice.
+        pixel_weight (int): Weight of one whole pixel in mat_data_weights, used to
+            convert the weights back to a number of pixels.
+
+    Returns:
+        None
+    """
+    ds_time[t_ndx] = date2num(d, units=ds_time.units)
+    if mat_data is None or mat_data_weights is None or np.max(mat_data_weights) <= 0:
+        ds_n[t_ndx, :, :] = 0
+        return
+    ds_n[t_ndx, :, :] = mat_data_weights / pixel_weight
+    filled = mat_data_weights > 0
+    for col, nc_var in enumerate(nc_dict.values()):
+        da = np.full(mat_data_weights.shape, -999, dtype=np.float32)
+        np.divide(mat_data[col], mat_data_weights, out=da, where=filled)
+        # Rounded in place, the fill value is unaffected
+        np.round(da, 6, out=da)
+        nc_var[t_ndx, :, :] = da
+
+
 def create_gridded_raster(
     start_date: datetime,
     end_date: datetime,
@@ -581,7 +703,8 @@ def create_gridded_raster(
     lon_res: float = 1.0,
     local_dir: str | None = None,
     filters: dict[str, tuple[str, float]] | None = None,
-    num_workers: int = 5,
+    num_workers: int | None = None,
+    download_granules: bool = False,
 ) -> str:
     """
     Create a gridded raster netCDF file from a dataset over a specified date range.
@@ -608,9 +731,14 @@ def create_gridded_raster(
         filters (dict[str, tuple[str, float]]): Optionally specify a list of filters
             where they key is the netCDF variable to filter on, and the values are a
             tuple of a comparator string (<, ==, etc.) and the threshold value
-        num_workers (int): Number of parallel workers to process the data. Default is 5.
-            Parallel processing is only used if local_dir is specified because GES DISC
-            does not support multiple pydap clients from the same IP.
+        num_workers (int | None): Number of parallel workers to process the data.
+            Default is None, which uses one worker per CPU. Parallel processing is only
+            used if local_dir is specified because GES DISC does not support multiple
+            pydap clients from the same IP.
+        download_granules (bool): Only used if local_dir is not specified. If True, each
+            day's granule is downloaded as a netCDF file in a single request and read in
+            memory, instead of reading each variable from the server using pydap. This is
+            faster when many variables are gridded. Default is False.
 
     Returns:
         str: The path to the output netCDF file.
@@ -625,11 +753,13 @@ def create_gridded_raster(
     if local_dir is None:
         dl = GesDiscDownloader()
         validate_date_range(dl, dataset, start_date, end_date)
-        if num_workers > 1:
+        if num_workers is not None and num_workers > 1:
             print("Warning: Parallel processing requires local_dir. Falling back to sequential processing.")
-            num_workers = 1
+        num_workers = 1
     else:
         validate_local_dir(local_dir, dataset, start_date, end_date)
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
 
     granule_schema: dict[str, str] | None = None
     for schema in L2_SCHEMAS:
@@ -680,6 +810,9 @@ def create_gridded_raster(
     ds_lon[:] = lon_vals
     ds_out.title = f"{start_date.strftime('%b %Y')} monthly average {dataset}"
 
+    # Each time slice is written in one go, so one chunk per time slice means every
+    # write compresses exactly one full chunk and never has to re-read another
+    chunksizes = (1, len(lon_vals), len(lat_vals))
     nc_dict: dict[str, Variable] = {}
     for var in variables:
         ds_var = ds_out.createVariable(
@@ -689,6 +822,7 @@ def create_gridded_raster(
             zlib=True,
             complevel=4,
             fill_value=-999.0,
+            chunksizes=chunksizes,
         )
         nc_dict[var] = ds_var
     ds_n = ds_out.createVariable(
@@ -698,6 +832,7 @@ def create_gridded_raster(
         zlib=True,
         complevel=4,
         fill_value=-999.0,
+        chunksizes=chunksizes,
     )
     ds_n.units = ""
     ds_n.long_name = "Number of pixels in average"
@@ -726,85 +861,170 @@ def create_gridded_raster(
                 
                 # Handle the result
                 if result_status == "success":
-                    if np.max(result_weights) > 0:
-                        ds_n[t_ndx, :, :] = result_weights
-                        ds_time[t_ndx] = date2num(d, units=ds_time.units)
-                        for col, var in enumerate(variables):
-                            da = np.round(result_data[:, :, col], 6)
-                            da[result_weights < 1e-10] = -999
-                            nc_dict[var][t_ndx, :, :] = da
-                    else:
-                        ds_n[t_ndx, :, :] = 0
-                        ds_time[t_ndx] = date2num(d, units=ds_time.units)
+                    write_time_slice(
+                        ds_time,
+                        ds_n,
+                        nc_dict,
+                        t_ndx,
+                        d,
+                        result_data,
+                        result_weights,
+                        n_grid * n_grid,
+                    )
                 elif result_status == "not_found":
                     print(f"No data found for {d.strftime('%Y-%m-%d')}, skipping")
-                    ds_n[t_ndx, :, :] = 0
-                    ds_time[t_ndx] = date2num(d, units=ds_time.units)
+                    write_time_slice(ds_time, ds_n, nc_dict, t_ndx, d)
                 else:
                     print(f"Error processing granule for {d.strftime('%Y-%m-%d')}: {result_status}")
-                    ds_n[t_ndx, :, :] = 0
-                    ds_time[t_ndx] = date2num(d, units=ds_time.units)
+                    write_time_slice(ds_time, ds_n, nc_dict, t_ndx, d)
     else:
         # Sequential processing
-        points = np.zeros((n_grid, n_grid, 2), dtype=np.float32)
+        points = np.zeros((POINTS_BLOCK, n_grid, n_grid, 2), dtype=np.float32)
+        edges = np.zeros((4, POINTS_BLOCK, n_grid), dtype=np.float32)
         n_vars = len(variables)
-        mat_data = np.zeros((len(lon_vals), len(lat_vals), n_vars), dtype=np.float32)
-        mat_data_weights = np.zeros((len(lon_vals), len(lat_vals)), dtype=np.float32)
+        # Writing (and compressing) a time slice happens on a background thread while
+        # the next one is gridded, so the grids are double buffered: a buffer is only
+        # reset and reused once the write of its previous time slice has finished
+        buffers = [
+            (
+                np.zeros((n_vars, len(lon_vals), len(lat_vals)), dtype=np.float32),
+                np.zeros((len(lon_vals), len(lat_vals)), dtype=np.uint32),
+            )
+            for _ in range(2)
+        ]
+        pending: list[Future | None] = [None, None]
+
+        # Granules are read with pydap unless they are local or downloaded whole
+        use_pydap = local_dir is None and not download_granules
+
+        def submit_write(*args) -> Future | None:
+            # The netCDF library is not thread safe, so writes only overlap with pydap
+            # reads; local and downloaded granules are read with netCDF4 and written
+            # inline instead
+            if use_pydap:
+                return writer.submit(write_time_slice, *args)
+            write_time_slice(*args)
+            return None
+
+        # Without local_dir, days whose granule does not intersect the grid according to
+        # CMR are skipped without opening the granule
+        days_in_grid = None
+        if local_dir is None:
+            days_in_grid = dl.get_dates_in_bbox( # type: ignore
+                dataset, start_date, end_date, (lon_min, lat_min, lon_max, lat_max)
+            )
 
-        for t_ndx, d in enumerate(tqdm(dates, desc="Time slices")):
-            try:
-                if local_dir is None:
-                    granule = dl.get_granule_by_date(dataset, d) # type: ignore
-                else:
-                    granule = get_local_granule(local_dir, dataset, d)
-
-                print(f"Gridding {d.strftime('%Y-%m-%d')} ({t_ndx + 1}/{n_time})")
-                process_day_granule(
-                    granule,
-                    lat_min,
-                    lat_max,
-                    lon_min,
-                    lon_max,
-                    variables,
-                    lat_vals,
-                    lon_vals,
-                    n_vars,
-                    points,
-                    mat_data,
-                    mat_data_weights,
-                    granule_schema,
-                    filters=filters,
-                    pydap=(local_dir is None),
-                )
+        def fetch_granule(d: datetime) -> object | None:
+            if not day_in_grid(d, days_in_grid):
+                return None
+            if download_granules:
+                return dl.open_granule_by_date(dataset, d) # type: ignore
+            return dl.get_granule_by_date(dataset, d) # type: ignore
+
+        # With pydap, the next day's granule is opened (the DDS/DAS round trips to the
+        # server) on a background thread while the current one is aggregated onto the
+        # grid. It is only submitted once the current day's variables have all been read,
+        # so there is never more than one pydap request in flight and the download
+        # session is never used from two threads at once.
+        next_granule: Future | None = None
+        t_next = 0
+
+        def prefetch() -> None:
+            nonlocal next_granule, t_next
+            if use_pydap and t_next < n_time and next_granule is None:
+                next_granule = fetcher.submit(fetch_granule, dates[t_next])
+                t_next += 1
+
+        with (
+            ThreadPoolExecutor(max_workers=1) as writer,
+            ThreadPoolExecutor(max_workers=1) as fetcher,
+        ):
+            prefetch()
+            for t_ndx, d in enumerate(tqdm(dates, desc="Time slices")):
+                this_granule = next_granule
+                next_granule = None
+                slot = t_ndx % 2
+                mat_data, mat_data_weights = buffers[slot]
+                if t_ndx >= len(buffers):
+                    if pending[slot] is not None:
+                        pending[slot].result() # type: ignore
+                    # Reset temporary arrays for the next time slice. A daily swath only
+                    # touches a small part of the grid, and cells are only ever updated
+                    # along with their weight, so only cells with a weight are cleared.
+                    touched = np.flatnonzero(mat_data_weights)
+                    if touched.size > mat_data_weights.size // 4:
+                        mat_data.fill(0.0)
+                        mat_data_weights.fill(0)
+                    else:
+                        mat_data.reshape(n_vars, -1)[:, touched] = 0.0
+                        mat_data_weights.ravel()[touched] = 0
 
-                if np.max(mat_data_weights) > 0:
-                    ds_n[t_ndx, :, :] = mat_data_weights
-                    ds_time[t_ndx] = date2num(d, units=ds_time.units)
-                    for col, var in enumerate(variables):
-                        da = np.round(mat_data[:, :, col], 6)
-                        da[mat_data_weights < 1e-10] = -999
-                        nc_dict[var][t_ndx, :, :] = da
-                else:
-                    ds_n[t_ndx, :, :] = 0
-                    ds_time[t_ndx] = date2num(d, units=ds_time.units)
-            except FileNotFoundError:
-                print(f"No data found for {d.strftime('%Y-%m-%d')}, skipping")
                 granule = None
-                ds_n[t_ndx, :, :] = 0
-                ds_time[t_ndx] = date2num(d, units=ds_time.units)
-            except Exception as e:
-                print(f"Error processing granule for {d.strftime('%Y-%m-%d')}: {e}")
-                granule = None
-                ds_n[t_ndx, :, :] = 0
-                ds_time[t_ndx] = date2num(d, units=ds_time.units)
-            finally:
-                # Close the granule file if it's a netCDF Dataset
-                if granule is not None and hasattr(granule, "close"): # type: ignore
-                    granule.close() # type: ignore
-
-            # Reset temporary arrays for the next time slice
-            mat_data.fill(0.0)
-            mat_data_weights.fill(0.0)
+                try:
+                    if this_granule is not None:
+                        granule = this_granule.result()
+                    elif local_dir is None:
+                        # Downloaded granules are opened with netCDF4, so they are not
+                        # prefetched on another thread
+                        granule = fetch_granule(d)
+                    else:
+                        granule = get_local_granule(local_dir, dataset, d)
+                    if granule is None:
+                        print(f"No granule intersects the grid on {d.strftime('%Y-%m-%d')}, skipping")
+                        prefetch()
+                        pending[slot] = submit_write(ds_time, ds_n, nc_dict, t_ndx, d)
+                        continue
+
+                    print(f"Gridding {d.strftime('%Y-%m-%d')} ({t_ndx + 1}/{n_time})")
+                    process_day_granule(
+                        granule,
+                        lat_min,
+                        lat_max,
+                        lon_min,
+                        lon_max,
+                        variables,
+                        lat_vals,
+                        lon_vals,
+                        n_vars,
+                        points,
+                        mat_data,
+                        mat_data_weights,
+                        granule_schema,
+                        filters=filters,
+                        pydap=use_pydap,
+                        edges=edges,
+                        reads_done=prefetch,
+                    )
+                    # Granules rejected before all of their variables are read never
+                    # call reads_done
+                    prefetch()
+                    pending[slot] = submit_write(
+                        ds_time,
+                        ds_n,
+                        nc_dict,
+                        t_ndx,
+                        d,
+                        mat_data,
+                        mat_data_weights,
+                        n_grid * n_grid,
+                    )
+                except FileNotFoundError:
+                    print(f"No data found for {d.strftime('%Y-%m-%d')}, skipping")
+                    prefetch()
+                    pending[slot] = submit_write(ds_time, ds_n, nc_dict, t_ndx, d)
+                except Exception as e:
+                    print(f"Error processing granule for {d.strftime('%Y-%m-%d')}: {e}")
+                    prefetch()
+                    pending[slot] = submit_write(ds_time, ds_n, nc_dict, t_ndx, d)
+                finally:
+                    # Close the granule file if it's a netCDF Dataset
+                    if granule is not None and hasattr(granule, "close"): # type: ignore
+                        granule.close() # type: ignore
+
+            # Surface any errors from the last writes
+            for future in pending:
+                if future is not None:
+                    future.result()
 
     ds_out.close()
     return out_file
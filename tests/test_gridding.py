@@ -0,0 +1,38 @@
+from datetime import datetime
+
+import numpy as np
+
+from pysif.gridding import POINTS_BLOCK, day_in_grid, favg_all, generate_dates
+
+
+def test_day_in_grid_ignores_time_of_day():
+    # get_dates_in_bbox returns days at midnight, while the gridded dates keep the
+    # time of day of start_date
+    days_in_grid = {datetime(2020, 6, 1), datetime(2020, 6, 3)}
+    dates = generate_dates(datetime(2020, 6, 1, 13, 30), datetime(2020, 6, 3, 13, 30))
+
+    assert [day_in_grid(d, days_in_grid) for d in dates] == [True, False, True]
+
+
+def test_day_in_grid_without_cmr_results():
+    assert day_in_grid(datetime(2020, 6, 2, 13, 30), None)
+
+
+def test_favg_all_sub_points_on_cell_edges():
+    # A footprint 8 cells tall and 2 cells wide split with n=4 puts its sub-points at
+    # latitude indices 1, 3, 5 and 7 exactly, which are floored into those cells, and at
+    # longitude indices 0.25, 0.75, 1.25 and 1.75
+    n = 4
+    lat = np.array([[0, 8, 8, 0]], dtype=np.int32)
+    lon = np.array([[0, 0, 2, 2]], dtype=np.int32)
+    inp = np.array([[2.0]], dtype=np.float32)
+    arr = np.zeros((1, 3, 9), dtype=np.float32)
+    weights = np.zeros((3, 9), dtype=np.uint32)
+    points = np.zeros((POINTS_BLOCK, n, n, 2), dtype=np.float32)
+
+    favg_all(arr, weights, lat, lon, inp, 1, 1, n, points)
+
+    expected = np.zeros((3, 9), dtype=np.uint32)
+    expected[0:2, [1, 3, 5, 7]] = 2
+    np.testing.assert_array_equal(weights, expected)
+    np.testing.assert_array_equal(arr[0], 2.0 * expected)